@@ -0,0 +1,48 @@
+import tracemalloc
+
+import pytest
+
+from metallum.client import Client
+from metallum.consts import BASE_URL
+from metallum.ratelimit import RateLimiter
+from tests.conftest import StubAdapter, load_fixture, site_pages
+
+pytest.importorskip("pytest_benchmark")
+
+
+def fresh_client():
+    """Client with an empty cache, serving the fixture pages of the site"""
+    rate_limiter = RateLimiter(rate=1_000_000, burst=1_000_000)
+    stub = StubAdapter(site_pages(), rate_limiter=rate_limiter)
+    client = Client(backend="memory", rate_limiter=rate_limiter)
+    client.mount(BASE_URL, stub)
+    return client, stub
+
+
+def allocated(create):
+    """
+    Measure the memory held by the objects created by a function
+
+    Returns:
+        tuple: The created objects, and the number of bytes they hold
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        created = create()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return created, after - before
+
+
+@pytest.fixture
+def client():
+    client, _ = fresh_client()
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def fixture():
+    return load_fixture
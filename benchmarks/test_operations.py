@@ -0,0 +1,67 @@
+"""End-to-end operations against the fixture site, starting with an empty
+cache. Besides their duration, the number of requests sent by each operation
+is recorded and checked, since it is what the rate limit makes expensive."""
+
+import pytest
+
+from benchmarks.conftest import fresh_client
+from metallum.operations import album_for_id, band_for_id, band_search, song_search
+
+pytest.importorskip("pytest_benchmark")
+
+
+def band_snapshot(client):
+    return band_for_id("125", client=client).to_dict()
+
+
+def band_discography(client):
+    return [album.title for album in band_for_id("125", client=client).albums]
+
+
+def album_snapshot(client):
+    return album_for_id("547", client=client).to_dict()
+
+
+def split_album_bands(client):
+    album = album_for_id("42682", client=client)
+    return [track.band.name for track in album.tracks]
+
+
+def search_and_get(client):
+    return band_search("metallica", client=client)[0].get().to_dict()
+
+
+def song_lyrics(client):
+    song = song_search(
+        "Fear of the Dark",
+        band="Iron Maiden",
+        release="Fear of the Dark",
+        client=client,
+    )[0]
+    return str(song.lyrics)
+
+
+@pytest.mark.parametrize(
+    "operation, requests",
+    [
+        (band_snapshot, 1),
+        (band_discography, 1),
+        (album_snapshot, 1),
+        (split_album_bands, 1),
+        (search_and_get, 2),
+        (song_lyrics, 2),
+    ],
+    ids=lambda value: getattr(value, "__name__", None),
+)
+def test_operation(benchmark, operation, requests):
+    stubs = []
+
+    def setup():
+        client, stub = fresh_client()
+        stubs.append(stub)
+        return (client,), {}
+
+    benchmark.pedantic(operation, setup=setup, rounds=20)
+    sent = {len(stub.requests) for stub in stubs}
+    benchmark.extra_info["requests"] = max(sent)
+    assert sent == {requests}
@@ -0,0 +1,105 @@
+"""Time spent parsing the fixture pages, without any I/O"""
+
+import json
+
+import pytest
+
+from benchmarks.conftest import allocated
+from metallum.models import AlbumCollection, AlbumWrapper, Band
+from metallum.models.lyrics import Lyrics
+from metallum.models.results import AlbumResult, BandResult, SongResult
+from metallum.models.search import Search
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_band_page(benchmark, client, fixture):
+    content = fixture("band_125.html")
+    snapshot = benchmark(
+        lambda: Band("bands/_/125", client=client, content=content).to_dict()
+    )
+    assert snapshot["name"] == "Metallica"
+
+
+def test_discography(benchmark, client, fixture):
+    content = fixture("discography_125.html")
+    url = "band/discography/id/125/tab/all"
+
+    def parse():
+        albums = AlbumCollection(url, client=client, content=content)
+        return [(album.title, album.type, album.year) for album in albums]
+
+    assert benchmark(parse)[0][0] == "No Life 'til Leather"
+
+
+@pytest.mark.parametrize(
+    "album_id, tracks",
+    [("547", 3), ("42682", 3), ("338756", 8)],
+    ids=["single-disc", "split", "multi-disc"],
+)
+def test_album_page(benchmark, client, fixture, album_id, tracks):
+    content = fixture(f"album_{album_id}.html")
+    url = f"albums/_/_/{album_id}"
+    snapshot = benchmark(
+        lambda: AlbumWrapper(url=url, client=client, content=content).to_dict()
+    )
+    assert len(snapshot["tracks"]) == tracks
+
+
+def test_lyrics(benchmark, client, fixture):
+    content = fixture("lyrics_5018A.html")
+    lyrics = benchmark(lambda: str(Lyrics("5018A", client=client, content=content)))
+    assert lyrics
+
+
+@pytest.mark.parametrize(
+    "name, result_handler",
+    [
+        ("search_bands_metallica.json", BandResult),
+        ("search_albums_tuonela.json", AlbumResult),
+        ("search_songs_fear.json", SongResult),
+    ],
+    ids=["bands", "albums", "songs"],
+)
+def test_search_page(benchmark, client, fixture, name, result_handler):
+    # A full page of results: the site returns up to 200 rows per page
+    data = json.loads(fixture(name))
+    data["aaData"] *= 200
+    content = json.dumps(data)
+
+    search = benchmark(
+        lambda: Search("search", result_handler, client=client, content=content)
+    )
+    assert len(search) == 200
+
+
+@pytest.mark.parametrize(
+    "name, result_handler",
+    [
+        ("search_bands_metallica.json", BandResult),
+        ("search_songs_fear.json", SongResult),
+    ],
+    ids=["bands", "songs"],
+)
+def test_search_result_memory(benchmark, client, fixture, name, result_handler):
+    rows = json.loads(fixture(name))["aaData"] * 1000
+
+    def create():
+        return [result_handler(row, client=client) for row in rows]
+
+    results, size = allocated(create)
+    benchmark.extra_info["bytes_per_result"] = size // len(results)
+    benchmark(create)
+
+
+def test_band_memory(benchmark, client, fixture):
+    content = fixture("band_125.html")
+
+    def create():
+        band = Band("bands/_/125", client=client, content=content)
+        band.to_dict()
+        return band
+
+    _, size = allocated(create)
+    benchmark.extra_info["bytes_per_band"] = size
+    benchmark(create)
@@ -2,20 +2,84 @@
 # encoding: utf-8
 """Python interface for www.metal-archives.com"""
 
-import requests_cache
-from requests_cache import remove_expired_responses
+import importlib
+from typing import TYPE_CHECKING
 
-from metallum.consts import CACHE_FILE
-from metallum.models.album_types import AlbumTypes
-from metallum.operations import album_for_id, band_search, song_search
+# Public names, mapped to the module defining them. Modules are only imported
+# when one of their names is first accessed (PEP 562), so that importing
+# metallum doesn't pull in requests, requests-cache, pyquery or lxml.
+_LAZY_ATTRIBUTES = {
+    "CacheVacuum": "metallum.client",
+    "Client": "metallum.client",
+    "configure": "metallum.client",
+    "get_client": "metallum.client",
+    "set_client": "metallum.client",
+    "vacuum_cache": "metallum.client",
+    "AlbumTypes": "metallum.models.album_types",
+    "IdentityMap": "metallum.identity_map",
+    "ObjectCache": "metallum.object_cache",
+    "album_for_id": "metallum.operations",
+    "album_search": "metallum.operations",
+    "albums_for_ids": "metallum.operations",
+    "band_for_id": "metallum.operations",
+    "band_search": "metallum.operations",
+    "bands_for_ids": "metallum.operations",
+    "lyrics_for_id": "metallum.operations",
+    "lyrics_for_ids": "metallum.operations",
+    "modified_bands": "metallum.operations",
+    "song_search": "metallum.operations",
+    "RateLimiter": "metallum.ratelimit",
+}
 
-requests_cache.install_cache(cache_name=CACHE_FILE, expire_after=300)
-remove_expired_responses()
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from metallum.client import (
+        CacheVacuum,
+        Client,
+        configure,
+        get_client,
+        set_client,
+        vacuum_cache,
+    )
+    from metallum.identity_map import IdentityMap
+    from metallum.models.album_types import AlbumTypes
+    from metallum.object_cache import ObjectCache
+    from metallum.operations import (
+        album_for_id,
+        album_search,
+        albums_for_ids,
+        band_for_id,
+        band_search,
+        bands_for_ids,
+        lyrics_for_id,
+        lyrics_for_ids,
+        modified_bands,
+        song_search,
+    )
+    from metallum.ratelimit import RateLimiter
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 
 if __name__ == "__main__":
     import doctest
 
+    from metallum.models.album_types import AlbumTypes
+    from metallum.operations import album_for_id, band_search, song_search
+
     # Test objects
     search_results = band_search("metallica")
     band = search_results[0].get()
@@ -34,4 +98,17 @@ if __name__ == "__main__":
         "Fear of the Dark", band="Iron Maiden", release="Fear of the Dark"
     )[0]
 
+    # Objects for the lists of modified bands, from a row of such a list
+    modified_band = ModifiedBandResult(
+        [
+            "October 18",
+            '<a href="https://www.metal-archives.com/bands/Metallica/125">'
+            "Metallica</a>",
+            '<a href="https://www.metal-archives.com/lists/US">United States</a>',
+            "Thrash Metal (early); Hard Rock (mid); Heavy/Thrash Metal (later)",
+            "2024-10-18 09:30:12",
+            '<a href="https://www.metal-archives.com/users/Ziltoid">Ziltoid</a>',
+        ]
+    )
+
     doctest.testmod(globs=locals())
@@ -0,0 +1,308 @@
+"""Asyncio interface for the Metallum API
+
+Every function mirrors its synchronous counterpart in `metallum.operations`
+(or the matching lazy property of a model) and returns the same model objects.
+Pages are fetched without blocking the event loop: requests that miss the
+cache first wait for the shared rate limiter on the loop, so any number of
+requests can be in flight while only a bounded pool of threads performs the
+actual I/O.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlsplit
+
+from metallum.client import Client, get_client
+from metallum.consts import ASYNC_WORKERS
+from metallum.models import (
+    Album,
+    AlbumCollection,
+    AlbumWrapper,
+    Band,
+    SimilarArtistsResult,
+    Track,
+    TrackCollection,
+)
+from metallum.models.lyrics import Lyrics
+from metallum.models.results import AlbumResult, BandResult, SongResult
+from metallum.models.search import Search
+from metallum.models.similar_artists import SimilarArtists
+from metallum.operations import album_search_url, band_search_url, song_search_url
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=ASYNC_WORKERS, thread_name_prefix="metallum"
+        )
+    return _executor
+
+
+class AsyncClient:
+    """
+    Asyncio front-end of a `Client`
+
+    Async clients are cheap: by default they all share one bounded pool of
+    I/O threads.
+
+    Args:
+        client: The client used to fetch pages, the process-wide one by default
+        executor: The threads performing network I/O
+    """
+
+    def __init__(
+        self,
+        client: Optional[Client] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self._client = client
+        self._executor = executor
+
+    def __repr__(self):
+        return f"<AsyncClient: {self.client!r}>"
+
+    @property
+    def client(self) -> Client:
+        """The synchronous client pages are bound to"""
+        return self._client or get_client()
+
+    async def fetch(self, url: str) -> str:
+        """
+        Fetch the content of a page of the site
+
+        Args:
+            url: The URL of the page, relative to the site root
+
+        Returns:
+            str: The page content
+        """
+        client = self.client
+        executor = self._executor or _get_executor()
+        loop = asyncio.get_running_loop()
+        # The cache is read in a worker too, and cached pages are returned
+        # from that single read
+        content = await loop.run_in_executor(executor, client.fetch_cached, url)
+        if content is not None:
+            return content
+
+        host = urlsplit(client.absolute_url(url)).hostname or ""
+        await client.rate_limiter.acquire_async(host)
+
+        def fetch_prepaid():
+            with client.rate_limiter.prepaid(host):
+                return client.fetch(url)
+
+        return await loop.run_in_executor(executor, fetch_prepaid)
+
+
+_default_async_client: Optional[AsyncClient] = None
+
+
+def get_async_client() -> AsyncClient:
+    """
+    Get the process-wide async client, creating it on first use
+
+    Returns:
+        AsyncClient: The shared async client
+    """
+    global _default_async_client  # pylint: disable=global-statement
+    if _default_async_client is None:
+        _default_async_client = AsyncClient()
+    return _default_async_client
+
+
+async def band_for_id(band_id: str, client: Optional[AsyncClient] = None) -> Band:
+    """
+    Get a band by its ID.
+
+    Args:
+        band_id: The band's ID.
+        client: The async client used to fetch the page.
+
+    Returns:
+        Band: The band with the given ID.
+    """
+    client = client or get_async_client()
+    url = Band.url_for(band_id)
+    content = await client.fetch(url)
+    return Band.for_id(band_id, client=client.client, content=content)
+
+
+async def album_for_id(
+    album_id: str, client: Optional[AsyncClient] = None
+) -> AlbumWrapper:
+    """
+    Get an album by its ID.
+
+    Args:
+        album_id: The album's ID.
+        client: The async client used to fetch the page.
+
+    Returns:
+        AlbumWrapper: The album with the given ID.
+    """
+    client = client or get_async_client()
+    url = Album.url_for(album_id)
+    content = await client.fetch(url)
+    return AlbumWrapper.for_id(album_id, client=client.client, content=content)
+
+
+async def lyrics_for_id(lyrics_id, client: Optional[AsyncClient] = None) -> Lyrics:
+    """
+    Get lyrics by their ID.
+
+    Args:
+        lyrics_id: The lyrics' ID.
+        client: The async client used to fetch the page.
+
+    Returns:
+        Lyrics: The lyrics with the given ID.
+    """
+    client = client or get_async_client()
+    content = await client.fetch(Lyrics.url_for(lyrics_id))
+    return Lyrics(lyrics_id, client=client.client, content=content)
+
+
+async def _search(
+    url, result_handler, client: Optional[AsyncClient], keep_html: bool
+) -> Search:
+    client = client or get_async_client()
+    content = await client.fetch(url)
+    return Search(
+        url, result_handler, client=client.client, content=content, keep_html=keep_html
+    )
+
+
+async def band_search(
+    name, client: Optional[AsyncClient] = None, keep_html: bool = False, **kwargs
+) -> Search:
+    """
+    Perform an advanced band search.
+
+    Args:
+        name: The band's name.
+        client: The async client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
+        **kwargs: Other search criteria, see `metallum.operations.band_search`.
+
+    Returns:
+        Search: The search results.
+    """
+    url = band_search_url(name, **kwargs)
+    return await _search(url, BandResult, client, keep_html)
+
+
+async def album_search(
+    title, client: Optional[AsyncClient] = None, keep_html: bool = False, **kwargs
+) -> Search:
+    """
+    Perform an advanced album search.
+
+    Args:
+        title: The album's title.
+        client: The async client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
+        **kwargs: Other search criteria, see `metallum.operations.album_search`.
+
+    Returns:
+        Search: The search results.
+    """
+    url = album_search_url(title, **kwargs)
+    return await _search(url, AlbumResult, client, keep_html)
+
+
+async def song_search(
+    title, client: Optional[AsyncClient] = None, keep_html: bool = False, **kwargs
+) -> Search:
+    """
+    Perform an advanced song search.
+
+    Args:
+        title: The song's title.
+        client: The async client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
+        **kwargs: Other search criteria, see `metallum.operations.song_search`.
+
+    Returns:
+        Search: The search results.
+    """
+    url = song_search_url(title, **kwargs)
+    return await _search(url, SongResult, client, keep_html)
+
+
+async def albums(band: Band, client: Optional[AsyncClient] = None) -> AlbumCollection:
+    """
+    Asynchronous version of `Band.albums`.
+
+    Args:
+        band: The band.
+        client: The async client used to fetch the page.
+
+    Returns:
+        AlbumCollection: The albums of the band.
+    """
+    client = client or AsyncClient(band._client)
+    url = band._albums_url
+    return AlbumCollection(url, client=client.client, content=await client.fetch(url))
+
+
+async def similar_artists(
+    band: Band, client: Optional[AsyncClient] = None
+) -> SimilarArtists:
+    """
+    Asynchronous version of `Band.similar_artists`.
+
+    Args:
+        band: The band.
+        client: The async client used to fetch the page.
+
+    Returns:
+        SimilarArtists: The artists similar to the band.
+    """
+    client = client or AsyncClient(band._client)
+    url = band._similar_artists_url
+    content = await client.fetch(url)
+    return SimilarArtists(
+        url, SimilarArtistsResult, client=client.client, content=content
+    )
+
+
+async def tracks(
+    album: AlbumWrapper, client: Optional[AsyncClient] = None
+) -> TrackCollection:
+    """
+    Asynchronous version of `AlbumWrapper.tracks`. The album page shared by
+    the album and its tracklist is fetched if needed, and the tracklist is
+    the one memoized by the album.
+
+    Args:
+        album: The album.
+        client: The async client used to fetch the page.
+
+    Returns:
+        TrackCollection: The tracks of the album.
+    """
+    client = client or AsyncClient(album._client)
+    page = album._album_page
+    if not page.is_loaded:
+        page._content = await client.fetch(page.url)
+    return album.tracks
+
+
+async def lyrics(track: Track, client: Optional[AsyncClient] = None) -> Lyrics:
+    """
+    Asynchronous version of `Track.lyrics`.
+
+    Args:
+        track: The track.
+        client: The async client used to fetch the page.
+
+    Returns:
+        Lyrics: The lyrics of the track.
+    """
+    client = client or AsyncClient(track.album._client)
+    return await lyrics_for_id(track.id, client)
@@ -0,0 +1,92 @@
+"""Fetch many Metallum pages concurrently"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
+
+
+class BulkResult(NamedTuple):
+    """
+    Outcome of fetching one item of a batch
+
+    Attributes:
+        id: The ID of the item
+        value: The fetched item, or None if it failed
+        error: The exception raised while fetching the item, if any
+    """
+
+    id: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was fetched successfully"""
+        return self.error is None
+
+
+def _fetch_one(fetch: Callable, item_id) -> BulkResult:
+    try:
+        return BulkResult(item_id, fetch(item_id).load())
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return BulkResult(item_id, error=e)
+
+
+def fetch_many(
+    fetch: Callable,
+    ids: Iterable,
+    workers: int = 4,
+    ordered: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Iterator[BulkResult]:
+    """
+    Fetch many pages concurrently
+
+    Duplicate IDs are fetched once. A failing item doesn't stop the batch: its
+    exception is returned in its result instead. At most `2 * workers` items
+    are in flight at a time, so arbitrarily long batches use bounded memory.
+
+    Args:
+        fetch: Function creating the page of an ID (e.g. `band_for_id`)
+        ids: The IDs to fetch
+        workers: Number of pages fetched concurrently
+        ordered: Whether results are returned in the order of `ids` rather
+            than as they complete
+        progress: Function called with (done, total) after each item
+
+    Returns:
+        Iterator[BulkResult]: The result of each distinct ID
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    total = len(unique_ids)
+    workers = max(workers, 1)
+    remaining = iter(unique_ids)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque(
+            executor.submit(_fetch_one, fetch, item_id)
+            for item_id in islice(remaining, 2 * workers)
+        )
+        try:
+            while pending:
+                if ordered:
+                    finished = [pending.popleft()]
+                else:
+                    completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    finished = [future for future in pending if future in completed]
+                    for future in finished:
+                        pending.remove(future)
+
+                for future in finished:
+                    result = future.result()
+                    for item_id in islice(remaining, 1):
+                        pending.append(executor.submit(_fetch_one, fetch, item_id))
+                    done += 1
+                    if progress is not None:
+                        progress(done, total)
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,413 @@
+"""Shared HTTP client used by all Metallum pages"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+from metallum.consts import (
+    BASE_URL,
+    CACHE_EXPIRE_AFTER,
+    CACHE_FILE,
+    CACHE_URLS_EXPIRE_AFTER,
+    HTTP_TIMEOUT,
+    USER_AGENT,
+)
+from metallum.utils import UserAgent, make_absolute, user_agent_provider
+
+if TYPE_CHECKING:
+    import requests_cache
+    from requests.adapters import HTTPAdapter
+
+    from metallum.identity_map import IdentityMap
+    from metallum.object_cache import ObjectCache
+    from metallum.ratelimit import RateLimiter
+
+
+class Client:
+    """
+    HTTP client shared by all Metallum pages.
+
+    A single client owns one cached session, and therefore one cache handle
+    and one connection pool, which are reused by every page fetched through it.
+
+    Args:
+        cache_name: The name of the cache: the SQLite file for the default
+            backend, the directory of the filesystem backend, or the key
+            prefix of the Redis backend.
+        backend: The requests-cache backend, either an instance or one of
+            "sqlite", "memory", "filesystem" or "redis".
+        expire_after: Default expiration for cached responses, in seconds
+            (-1 never expires).
+        urls_expire_after: Expiration of the responses whose URL matches a
+            pattern, overriding `expire_after`. The first matching pattern
+            wins. By default lyrics never expire, searches expire after ten
+            minutes, band and album pages after a day or a week, and the
+            lists of modified bands are not cached.
+        stale_while_revalidate: Whether an expired response is returned
+            immediately while it is refreshed in a background thread. A
+            number of seconds limits how long after expiration it may be used.
+        always_revalidate: Whether cached responses with an ETag or
+            Last-Modified validator are revalidated with the site on every
+            request, even before they expire.
+        cache_control: Whether the expiration set by the site's Cache-Control
+            and Expires headers takes precedence over `expire_after`.
+        pool_connections: Number of host connection pools to keep.
+        pool_maxsize: Maximum number of connections kept per pool.
+        keep_alive: Whether connections should be kept alive between requests.
+        headers: Extra headers sent with every request.
+        timeout: Timeout for each HTTP request, in seconds.
+        rate_limiter: The request budget, shared by all clients by default.
+        user_agent: Either a fixed User-Agent, a list of User-Agents used in
+            turn, or a function returning the User-Agent of each request.
+        object_cache: Cache of parsed bands and albums, which are then served
+            without reading nor parsing their page. Disabled by default.
+        identity_map: Map resolving each band or album ID to a single object
+            among those created with this client. Disabled by default.
+        base_url: The root of the site, e.g. the URL of a local
+            `metallum.standin` server.
+        cassette: The path of a cassette file (see `metallum.replay`). Pages
+            are then served from the cassette instead of the network.
+        record: Whether pages missing from the cassette are fetched and added
+            to it. Otherwise, requesting them raises `CassetteMiss`.
+        **cache_options: Options of the cache backend (e.g. `connection` for
+            the Redis backend).
+    """
+
+    def __init__(
+        self,
+        cache_name: str = CACHE_FILE,
+        backend="sqlite",
+        expire_after=CACHE_EXPIRE_AFTER,
+        urls_expire_after: Optional[Dict[str, int]] = None,
+        stale_while_revalidate=False,
+        always_revalidate: bool = False,
+        cache_control: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = HTTP_TIMEOUT,
+        rate_limiter: Optional["RateLimiter"] = None,
+        user_agent: UserAgent = USER_AGENT,
+        object_cache: Optional["ObjectCache"] = None,
+        identity_map: Optional["IdentityMap"] = None,
+        base_url: str = BASE_URL,
+        cassette: Optional[str] = None,
+        record: bool = False,
+        **cache_options,
+    ):
+        # Imported here to keep `import metallum` cheap
+        import requests_cache  # pylint: disable=import-outside-toplevel
+
+        from metallum.ratelimit import (  # pylint: disable=import-outside-toplevel
+            ThrottledAdapter,
+            get_rate_limiter,
+        )
+
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/")
+        self.object_cache = object_cache
+        self.identity_map = identity_map
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+        if urls_expire_after is None:
+            urls_expire_after = CACHE_URLS_EXPIRE_AFTER
+        self._session = requests_cache.CachedSession(
+            cache_name=cache_name,
+            backend=backend,
+            expire_after=expire_after,
+            urls_expire_after=urls_expire_after,
+            stale_while_revalidate=stale_while_revalidate,
+            always_revalidate=always_revalidate,
+            cache_control=cache_control,
+            **cache_options,
+        )
+        self._session.headers = {
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        # A fixed User-Agent is sent as a session header, other ones are
+        # picked for each request
+        self._user_agent = None
+        if isinstance(user_agent, str):
+            self._session.headers["User-Agent"] = user_agent
+        else:
+            self._user_agent = user_agent_provider(user_agent)
+        if headers:
+            self._session.headers.update(headers)
+
+        adapter = ThrottledAdapter(
+            self.rate_limiter,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        if cassette is not None:
+            from metallum.replay import (  # pylint: disable=import-outside-toplevel
+                Cassette,
+                ReplayAdapter,
+            )
+
+            adapter = ReplayAdapter(Cassette(cassette), record=record, adapter=adapter)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def __repr__(self):
+        return f"<Client: {self._session.cache.cache_name}>"
+
+    @property
+    def session(self) -> "requests_cache.CachedSession":
+        """The underlying cached session"""
+        return self._session
+
+    @property
+    def cache(self) -> "requests_cache.BaseCache":
+        """The cache backend shared by every page fetched with this client"""
+        return self._session.cache
+
+    def mount(self, prefix: str, adapter: "HTTPAdapter") -> None:
+        """
+        Mount a transport adapter for all URLs starting with `prefix`
+
+        Args:
+            prefix: The URL prefix
+            adapter: The transport adapter
+        """
+        self._session.mount(prefix, adapter)
+
+    def absolute_url(self, url: str) -> str:
+        """
+        Get the absolute URL of a page of the site
+
+        Args:
+            url: The URL of the page, relative to the site root
+
+        Returns:
+            str: The absolute URL
+        """
+        return make_absolute(url, self.base_url)
+
+    def get(self, url: str, only_if_cached: bool = False):
+        """
+        Fetch a page of the site
+
+        Args:
+            url: The URL of the page, relative to the site root
+            only_if_cached: Whether to only read the page from the cache,
+                without sending any request. Pages which can't be served from
+                the cache get a 504 Gateway Timeout response.
+
+        Returns:
+            requests.Response: The response
+        """
+        headers = None
+        if self._user_agent is not None:
+            headers = {"User-Agent": self._user_agent()}
+        return self._session.get(
+            self.absolute_url(url),
+            headers=headers,
+            timeout=self.timeout,
+            only_if_cached=only_if_cached,
+        )
+
+    def fetch(self, url: str) -> str:
+        """
+        Fetch the content of a page of the site
+
+        Args:
+            url: The URL of the page, relative to the site root
+
+        Returns:
+            str: The page content
+
+        Raises:
+            requests.HTTPError: If the site answered with an error status
+                (404 Not Found, 429 Too Many Requests after the retries...)
+        """
+        response = self.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def cache_key(self, url: str) -> str:
+        """
+        Get the key of a page in the cache
+
+        Args:
+            url: The URL of the page, relative to the site root
+
+        Returns:
+            str: The cache key of the page
+        """
+        # Imported here to keep `import metallum` cheap
+        from requests import Request  # pylint: disable=import-outside-toplevel
+
+        # Cache keys depend on the session headers and on the certificates
+        # used (e.g. from REQUESTS_CA_BUNDLE), compute them as when the
+        # request is sent
+        url = self.absolute_url(url)
+        request = self._session.prepare_request(Request("GET", url))
+        settings = self._session.merge_environment_settings(url, {}, None, None, None)
+        return self.cache.create_key(request, verify=settings["verify"])
+
+    def fetch_cached(self, url: str) -> Optional[str]:
+        """
+        Fetch the content of a page of the site only if it can be served from
+        the cache, without sending any request
+
+        Args:
+            url: The URL of the page, relative to the site root
+
+        Returns:
+            str: The page content, or None if the page isn't cached or expired
+        """
+        response = self.get(url, only_if_cached=True)
+        # Pages missing from the cache get a 504 response (error responses
+        # aren't cached)
+        if response.status_code == 504:
+            return None
+        response.raise_for_status()
+        return response.text
+
+    def invalidate(self, *urls: str) -> None:
+        """
+        Delete pages from the cache, so that they are downloaded again when
+        they are next fetched
+
+        Args:
+            *urls: The URLs of the pages, relative to the site root
+        """
+        self.cache.delete(*(self.cache_key(url) for url in urls))
+
+    def vacuum(self) -> None:
+        """
+        Delete the expired responses from the cache
+
+        Expired responses with an ETag or Last-Modified validator are kept:
+        they are revalidated with a conditional request when they are next
+        used, which costs much less than downloading the page again.
+        """
+        cache = self._session.cache
+        keys = [
+            response.cache_key
+            for response in cache.filter(valid=False, expired=True)
+            if not _has_validator(response)
+        ]
+        if keys:
+            cache.delete(*keys)
+
+    def close(self) -> None:
+        """Close the connection pool and the cache handle"""
+        self._session.close()
+
+
+def _has_validator(response) -> bool:
+    return "ETag" in response.headers or "Last-Modified" in response.headers
+
+
+class CacheVacuum(threading.Thread):
+    """
+    Daemon thread deleting the expired responses of a client's cache every
+    `interval` seconds
+
+    Args:
+        client: The client whose cache is vacuumed
+        interval: Time between two vacuums, in seconds
+    """
+
+    def __init__(self, client: Client, interval: float):
+        super().__init__(name="metallum-cache-vacuum", daemon=True)
+        self.client = client
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.client.vacuum()
+
+    def stop(self) -> None:
+        """Stop vacuuming"""
+        self._stopped.set()
+
+
+_default_client: Optional[Client] = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> Client:
+    """
+    Get the process-wide client, creating it on first use
+
+    Returns:
+        Client: The shared client
+    """
+    global _default_client  # pylint: disable=global-statement
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = Client()
+    return _default_client
+
+
+def configure(**kwargs) -> Client:
+    """
+    Create the process-wide client with custom settings. Importing metallum
+    has no side effects: nothing is fetched, cached or patched until a page
+    is requested or this function is called.
+
+    The previous process-wide client, if any, is closed.
+
+    Args:
+        **kwargs: The settings of the client, see `Client`
+
+    Returns:
+        Client: The new shared client
+    """
+    global _default_client  # pylint: disable=global-statement
+    client = Client(**kwargs)
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+    if previous is not None:
+        previous.close()
+    return client
+
+
+def vacuum_cache(
+    client: Optional[Client] = None,
+    background: bool = False,
+    interval: Optional[float] = None,
+) -> Optional[threading.Thread]:
+    """
+    Delete the expired responses from the cache
+
+    Args:
+        client: The client whose cache is vacuumed, the shared one by default
+        background: Whether to vacuum once in a background thread
+        interval: If set, keep vacuuming every `interval` seconds in a
+            `CacheVacuum` thread
+
+    Returns:
+        threading.Thread: The background thread, if any
+    """
+    client = client or get_client()
+    if interval is not None:
+        thread = CacheVacuum(client, interval)
+    elif background:
+        thread = threading.Thread(
+            target=client.vacuum, name="metallum-cache-vacuum", daemon=True
+        )
+    else:
+        client.vacuum()
+        return None
+    thread.start()
+    return thread
+
+
+def set_client(client: Optional[Client]) -> None:
+    """
+    Replace the process-wide client used by pages created without one. The
+    previous client isn't closed, since it may still be used by its owner.
+
+    Args:
+        client: The new shared client, or None to create a fresh one on next use
+    """
+    global _default_client  # pylint: disable=global-statement
+    with _default_client_lock:
+        _default_client = client
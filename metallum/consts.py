@@ -9,12 +9,60 @@ CACHE_FILE = os.path.join(tempfile.gettempdir(), "metallum_cache")
 # Site details
 BASE_URL = "https://www.metal-archives.com"
 
+# Expiration of cached pages, in seconds (-1 never expires). Pages are
+# matched against the URL patterns in order, and fall back to CACHE_EXPIRE_AFTER
+_SITE = BASE_URL.split("://")[-1]
+CACHE_EXPIRE_AFTER = 24 * 3600
+CACHE_URLS_EXPIRE_AFTER = {
+    f"{_SITE}/release/ajax-view-lyrics/": -1,
+    f"{_SITE}/search/": 10 * 60,
+    # The lists of modified bands change all the time and are read to find
+    # changes, so they are always downloaded again
+    f"{_SITE}/archives/ajax-band/": 0,
+    f"{_SITE}/albums/": 7 * 24 * 3600,
+    f"{_SITE}/bands/": 24 * 3600,
+    f"{_SITE}/band/": 24 * 3600,
+}
+
+# Number of parsed entities kept by an ObjectCache, and their lifetime in seconds
+OBJECT_CACHE_SIZE = 4096
+OBJECT_CACHE_TTL = 3600.0
+
+# Number of model objects kept alive by an IdentityMap
+IDENTITY_MAP_SIZE = 1024
+
 # HTML entities
 BR = "<br/>"
 CR = "&#13;"
 
+# User-Agent sent with every request, unless the client is given another one
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.4 Safari/605.1.15"
+)
+
 # Timeout between page requests, in seconds
 REQUEST_TIMEOUT = 1.0
 
+# Number of requests that may be sent back to back before throttling
+REQUEST_BURST = 1
+
+# Retries for throttled responses, with exponential backoff in seconds
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
+RETRY_STATUS_CODES = (429, 503)
+
+# Timeout for a single HTTP request, in seconds
+HTTP_TIMEOUT = 30.0
+
+# Number of threads performing network I/O for the asyncio interface
+ASYNC_WORKERS = 16
+
 # UTC offset
 UTC_OFFSET = 4
+
+# Number of rows of a table written at once by the exporters
+EXPORT_BATCH_SIZE = 1000
+
+# Minimum similarity of the words matched by a fuzzy search of the index
+FUZZY_CUTOFF = 0.75
@@ -0,0 +1,394 @@
+"""Resumable crawler of bands, albums and lyrics"""
+
+import datetime
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from metallum.client import get_client
+from metallum.models import Album, AlbumWrapper, Band
+from metallum.models.lyrics import Lyrics
+from metallum.operations import modified_bands
+
+BAND = "band"
+ALBUM = "album"
+LYRICS = "lyrics"
+
+_PENDING = "pending"
+_DONE = "done"
+_FAILED = "failed"
+
+_SYNCED = "synced"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    modified TEXT,
+    refresh INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (kind, id)
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, seq);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Columns added to the state files of earlier versions
+_MIGRATIONS = {
+    "modified": "ALTER TABLE items ADD COLUMN modified TEXT",
+    "refresh": "ALTER TABLE items ADD COLUMN refresh INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _months(start: datetime.datetime, end: datetime.datetime) -> Iterator[str]:
+    """
+    List the months between two times, as "YYYY-MM" strings
+
+    The site lists changes by month of its own time zone, so the months
+    around the bounds are included too.
+
+    Examples:
+        >>> start, end = datetime.datetime(2023, 11, 30), datetime.datetime(2024, 1, 2)
+        >>> list(_months(start, end))
+        ['2023-11', '2023-12', '2024-01']
+    """
+    day = datetime.timedelta(days=1)
+    year, month = (start - day).year, (start - day).month
+    last = ((end + day).year, (end + day).month)
+    while (year, month) <= last:
+        yield f"{year:04d}-{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class CrawlRecord(NamedTuple):
+    """
+    An entity fetched by the crawler
+
+    Attributes:
+        kind: The kind of entity ("band", "album" or "lyrics")
+        id: The ID of the entity
+        data: The fields of the entity (see the `to_dict` methods)
+    """
+
+    kind: str
+    id: str
+    data: Dict[str, Any]
+
+
+class Crawler:
+    """
+    Breadth-first crawler of bands, their albums, and the lyrics of their
+    tracks
+
+    The crawl state is kept in a SQLite file: every entity ever discovered,
+    in discovery order, and whether it was already crawled. Each entity is
+    therefore fetched once, and an interrupted crawl resumes where it
+    stopped when `crawl` is called again with the same state file.
+
+    Records are delivered at least once: the record being processed when the
+    crawl is interrupted is delivered again on resume.
+
+    Requests go through the client, and therefore its cache and rate limiter.
+
+    Args:
+        path: The path of the state file
+        client: The client used to fetch the pages
+        albums: Whether to crawl the albums of the bands
+        lyrics: Whether to crawl the lyrics of the album tracks
+    """
+
+    def __init__(
+        self, path: str, client=None, albums: bool = True, lyrics: bool = True
+    ):
+        self.path = path
+        self.albums = albums
+        self.lyrics = lyrics
+        self._client = client
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(items)")}
+        with self._db:
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    self._db.execute(statement)
+
+    def __repr__(self):
+        return f"<Crawler: {self.path}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def client(self):
+        """The client used to fetch the pages"""
+        return self._client or get_client()
+
+    def add(self, kind: str, ids: Iterable[str]) -> None:
+        """
+        Add entities to crawl. Entities which were already discovered are
+        ignored.
+
+        Args:
+            kind: The kind of the entities ("band", "album" or "lyrics")
+            ids: The IDs of the entities
+        """
+        with self._db:
+            self._enqueue(kind, ids)
+
+    def add_bands(self, ids: Iterable[str]) -> None:
+        """
+        Add bands to crawl, e.g. the IDs of the results of a search
+
+        Args:
+            ids: The IDs of the bands
+        """
+        self.add(BAND, ids)
+
+    def crawl(self, limit: Optional[int] = None) -> Iterator[CrawlRecord]:
+        """
+        Crawl the pending entities in discovery order, including those
+        discovered along the way
+
+        Entities which fail to be fetched are marked as failed and skipped.
+        They can be crawled again with `retry_failed`.
+
+        Args:
+            limit: Maximum number of entities to crawl
+
+        Returns:
+            Iterator[CrawlRecord]: The crawled entities
+        """
+        with self._db:
+            # Changes made on the site from now on are caught by `sync`
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                (_SYNCED, _utcnow().isoformat()),
+            )
+
+        crawled = 0
+        while limit is None or crawled < limit:
+            row = self._db.execute(
+                "SELECT seq, kind, id, refresh FROM items WHERE state = ? "
+                "ORDER BY seq LIMIT 1",
+                (_PENDING,),
+            ).fetchone()
+            if row is None:
+                return
+            seq, kind, item_id, refresh = row
+
+            try:
+                data, children = self._fetch(kind, item_id, bool(refresh))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                with self._db:
+                    self._db.execute(
+                        "UPDATE items SET state = ?, error = ? WHERE seq = ?",
+                        (_FAILED, f"{type(e).__name__}: {e}", seq),
+                    )
+                continue
+
+            yield CrawlRecord(kind, item_id, data)
+            crawled += 1
+            with self._db:
+                for child_kind, child_ids in children.items():
+                    self._enqueue(child_kind, child_ids)
+                modified = data.get("modified")
+                self._db.execute(
+                    "UPDATE items SET state = ?, error = NULL, modified = ?, "
+                    "refresh = 0 WHERE seq = ?",
+                    (_DONE, modified and modified.isoformat(), seq),
+                )
+
+    def update(
+        self,
+        kind: str,
+        changes: Iterable[Tuple[str, Optional[datetime.datetime]]],
+        add: bool = False,
+    ) -> int:
+        """
+        Crawl again the entities which changed since they were crawled
+
+        Crawled entities are queued again if they were modified after the
+        modification time they had when they were crawled. Their pages are
+        then downloaded again instead of being read from the cache, and the
+        entities they link to which weren't discovered yet (e.g. the new
+        albums of a band) are crawled too.
+
+        Args:
+            kind: The kind of the entities
+            changes: The ID of each entity and the time it was last modified,
+                or None if it is unknown
+            add: Whether to also crawl the entities which weren't discovered
+                yet
+
+        Returns:
+            int: The number of entities queued
+        """
+        queued = 0
+        with self._db:
+            for item_id, modified in changes:
+                stamp = modified and modified.isoformat()
+                cursor = self._db.execute(
+                    "UPDATE items SET state = ?, refresh = 1 "
+                    "WHERE kind = ? AND id = ? AND state = ? "
+                    "AND (modified IS NULL OR ? IS NULL OR modified < ?)",
+                    (_PENDING, kind, str(item_id), _DONE, stamp, stamp),
+                )
+                queued += cursor.rowcount
+                if add:
+                    cursor = self._db.execute(
+                        "INSERT OR IGNORE INTO items (kind, id) VALUES (?, ?)",
+                        (kind, str(item_id)),
+                    )
+                    queued += cursor.rowcount
+        return queued
+
+    def sync(self, since: Optional[datetime.datetime] = None, add: bool = False) -> int:
+        """
+        Crawl again the bands modified on the site since the last sync
+
+        The changes are read from the site's lists of recently modified
+        bands, which cost one request per few hundred changes instead of one
+        per band. Modified bands are then refreshed by `crawl`, along with
+        their discography.
+
+        The lists are never served from the HTTP cache by default (see
+        `CACHE_URLS_EXPIRE_AFTER`): a client caching them would miss the
+        changes made since they were cached.
+
+        Args:
+            since: The time (in UTC) to look for changes from, by default the
+                time of the last sync, or of the start of the first crawl
+            add: Whether to also crawl the bands added to the site since then
+
+        Returns:
+            int: The number of bands queued
+        """
+        started = _utcnow()
+        if since is None:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = ?", (_SYNCED,)
+            ).fetchone()
+            if row is None:
+                raise ValueError("Nothing was crawled yet, `since` is required")
+            since = datetime.datetime.fromisoformat(row[0])
+
+        queued = 0
+        for created in (False, True) if add else (False,):
+            for month in _months(since, started):
+                results = modified_bands(
+                    month, created=created, client=self.client
+                ).iter_results()
+                changes = (
+                    (result.id, result.modified)
+                    for result in results
+                    if result.modified is None or result.modified >= since
+                )
+                queued += self.update(BAND, changes, add=created)
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (_SYNCED, started.isoformat()),
+            )
+        return queued
+
+    def retry_failed(self) -> int:
+        """
+        Mark the entities which failed to be fetched as pending again
+
+        Returns:
+            int: The number of entities to retry
+        """
+        with self._db:
+            cursor = self._db.execute(
+                "UPDATE items SET state = ? WHERE state = ?", (_PENDING, _FAILED)
+            )
+        return cursor.rowcount
+
+    def failures(self) -> Dict[tuple, str]:
+        """
+        Get the entities which failed to be fetched
+
+        Returns:
+            dict: The error of each failed entity, keyed by (kind, id)
+        """
+        rows = self._db.execute(
+            "SELECT kind, id, error FROM items WHERE state = ? ORDER BY seq",
+            (_FAILED,),
+        )
+        return {(kind, item_id): error for kind, item_id, error in rows}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count the entities of each kind in each state
+
+        Returns:
+            dict: The number of entities, keyed by kind then state
+        """
+        stats: Dict[str, Dict[str, int]] = {}
+        rows = self._db.execute(
+            "SELECT kind, state, COUNT(*) FROM items GROUP BY kind, state"
+        )
+        for kind, state, count in rows:
+            stats.setdefault(kind, {})[state] = count
+        return stats
+
+    def close(self) -> None:
+        """Close the state file"""
+        self._db.close()
+
+    def _enqueue(self, kind: str, ids: Iterable[str]) -> None:
+        self._db.executemany(
+            "INSERT OR IGNORE INTO items (kind, id) VALUES (?, ?)",
+            ((kind, str(item_id)) for item_id in ids),
+        )
+
+    def _fetch(self, kind: str, item_id: str, refresh: bool = False):
+        """
+        Fetch an entity
+
+        Args:
+            kind: The kind of the entity
+            item_id: The ID of the entity
+            refresh: Whether to download its pages again instead of reading
+                them from the cache
+
+        Returns:
+            tuple: The fields of the entity, and the IDs of the entities it
+            links to, keyed by kind
+        """
+        client = self.client
+        if kind == BAND:
+            band = Band.for_id(item_id, client=client)
+            if refresh:
+                client.invalidate(Band.url_for(item_id), band._albums_url)
+                band.refresh()
+            data = band.to_dict()
+            albums = [album.id for album in band.albums] if self.albums else []
+            return data, {ALBUM: albums}
+        if kind == ALBUM:
+            album = AlbumWrapper.for_id(item_id, client=client)
+            if refresh:
+                client.invalidate(Album.url_for(item_id))
+                album.refresh()
+            data = album.to_dict()
+            lyrics = []
+            if self.lyrics:
+                lyrics = [track.id for track in album.tracks if track.has_lyrics]
+            return data, {LYRICS: lyrics}
+        if kind == LYRICS:
+            if refresh:
+                client.invalidate(Lyrics.url_for(item_id))
+            return Lyrics(item_id, client=client).to_dict(), {}
+        raise ValueError(f"Unknown kind: {kind}")
@@ -0,0 +1,573 @@
+"""Streaming export of entities to JSON Lines, Parquet and SQLite
+
+Exporters consume entities one at a time, as they are fetched (e.g. from
+`Crawler.crawl` or `bulk.fetch_many`), and write them out in bounded batches,
+so memory use doesn't grow with the size of the export.
+
+JSON Lines keeps each entity as a nested document. Parquet and SQLite split
+entities into normalized tables:
+
+- bands: One row per band
+- albums: One row per album
+- album_bands: The bands of each album (split albums have several)
+- tracks: The tracks of each album
+- lyrics: The lyrics of each track, keyed by the track ID
+- band_results, album_results, song_results: Search results. They only hold
+  the few fields of a result, so they are kept apart from the full entities.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+from typing import IO, Any, Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from metallum.consts import EXPORT_BATCH_SIZE
+from metallum.crawler import ALBUM, BAND, LYRICS, CrawlRecord
+from metallum.models import Album, AlbumWrapper, Band, Track
+from metallum.models.lyrics import Lyrics
+from metallum.models.results import (
+    AlbumResult,
+    BandResult,
+    ModifiedBandResult,
+    SearchResult,
+    SongResult,
+)
+
+TRACK = "track"
+BAND_RESULT = "band_result"
+ALBUM_RESULT = "album_result"
+SONG_RESULT = "song_result"
+
+# Kinds of the search results
+_RESULT_KINDS = (
+    (BandResult, BAND_RESULT),
+    (ModifiedBandResult, BAND_RESULT),
+    (AlbumResult, ALBUM_RESULT),
+    (SongResult, SONG_RESULT),
+)
+
+# Column types of the normalized tables
+_TEXT = "text"
+_INTEGER = "integer"
+_TIMESTAMP = "timestamp"
+_LIST = "list"
+
+_TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "bands": (
+        ("id", _TEXT),
+        ("name", _TEXT),
+        ("country", _TEXT),
+        ("location", _TEXT),
+        ("status", _TEXT),
+        ("formed_in", _TEXT),
+        ("genres", _LIST),
+        ("themes", _LIST),
+        ("label", _TEXT),
+        ("logo", _TEXT),
+        ("photo", _TEXT),
+        ("added", _TIMESTAMP),
+        ("modified", _TIMESTAMP),
+    ),
+    "albums": (
+        ("id", _TEXT),
+        ("title", _TEXT),
+        ("type", _TEXT),
+        ("date", _TIMESTAMP),
+        ("label", _TEXT),
+        ("score", _INTEGER),
+        ("review_count", _INTEGER),
+        ("duration", _INTEGER),
+        ("cover", _TEXT),
+        ("added", _TIMESTAMP),
+        ("modified", _TIMESTAMP),
+    ),
+    "album_bands": (
+        ("album_id", _TEXT),
+        ("band_id", _TEXT),
+        ("name", _TEXT),
+    ),
+    "tracks": (
+        ("id", _TEXT),
+        ("album_id", _TEXT),
+        ("number", _INTEGER),
+        ("overall_number", _INTEGER),
+        ("disc_number", _INTEGER),
+        ("title", _TEXT),
+        ("full_title", _TEXT),
+        ("duration", _INTEGER),
+        ("band_id", _TEXT),
+        ("band_name", _TEXT),
+    ),
+    "lyrics": (
+        ("id", _TEXT),
+        ("lyrics", _TEXT),
+    ),
+    "band_results": (
+        ("id", _TEXT),
+        ("name", _TEXT),
+        ("country", _TEXT),
+        ("genres", _LIST),
+        ("modified", _TIMESTAMP),
+    ),
+    "album_results": (
+        ("id", _TEXT),
+        ("title", _TEXT),
+        ("type", _TEXT),
+        ("band_ids", _LIST),
+        ("band_names", _LIST),
+    ),
+    "song_results": (
+        ("id", _TEXT),
+        ("title", _TEXT),
+        ("type", _TEXT),
+        ("album_id", _TEXT),
+        ("album_title", _TEXT),
+        ("band_ids", _LIST),
+        ("band_names", _LIST),
+        ("genres", _LIST),
+    ),
+}
+
+_PRIMARY_KEYS = {
+    "bands": ("id",),
+    "albums": ("id",),
+    "album_bands": ("album_id", "band_id"),
+    "tracks": ("id",),
+    "lyrics": ("id",),
+    "band_results": ("id",),
+    "album_results": ("id",),
+    "song_results": ("id",),
+}
+
+# Tables holding the parts of an album, which are replaced with it
+_ALBUM_PARTS = ("album_bands", "tracks")
+
+Exportable = Union[CrawlRecord, Band, Album, AlbumWrapper, Track, Lyrics, SearchResult]
+
+
+def to_record(item: Exportable) -> Tuple[str, Dict[str, Any]]:
+    """
+    Get the kind and the fields of an entity
+
+    Args:
+        item: A crawl record, a band, album, track or lyrics, or a search
+            result
+
+    Returns:
+        tuple: The kind of the entity ("band", "album", "track", "lyrics",
+        "band_result", "album_result" or "song_result") and its fields
+    """
+    if isinstance(item, CrawlRecord):
+        return item.kind, item.data
+    if isinstance(item, Band):
+        return BAND, item.to_dict()
+    if isinstance(item, (Album, AlbumWrapper)):
+        return ALBUM, item.to_dict()
+    if isinstance(item, Track):
+        return TRACK, dict(item.to_dict(), album_id=item.album.id)
+    if isinstance(item, Lyrics):
+        return LYRICS, item.to_dict()
+    for result_type, kind in _RESULT_KINDS:
+        if isinstance(item, result_type):
+            return kind, item.to_dict()
+    raise TypeError(f"Can't export {type(item).__name__} objects")
+
+
+def _track_row(track: Dict[str, Any], album_id: str) -> Dict[str, Any]:
+    row = {key: value for key, value in track.items() if key != "band"}
+    row["album_id"] = album_id
+    row["band_id"] = track["band"]["id"]
+    row["band_name"] = track["band"]["name"]
+    return row
+
+
+def _result_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    row = {key: value for key, value in result.items() if key not in ("bands", "album")}
+    row["band_ids"] = [band["id"] for band in result["bands"]]
+    row["band_names"] = [band["name"] for band in result["bands"]]
+    if "album" in result:
+        row["album_id"] = result["album"]["id"]
+        row["album_title"] = result["album"]["title"]
+    return row
+
+
+def normalize(kind: str, data: Dict[str, Any]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Split the fields of an entity into rows of the normalized tables
+
+    Args:
+        kind: The kind of the entity
+        data: The fields of the entity
+
+    Returns:
+        Iterator[tuple]: The name of the table and the row, for each row
+    """
+    if kind == BAND:
+        yield "bands", data
+    elif kind == ALBUM:
+        album_id = data["id"]
+        yield "albums", data
+        for band in data.get("bands", ()):
+            yield "album_bands", {
+                "album_id": album_id,
+                "band_id": band["id"],
+                "name": band["name"],
+            }
+        for track in data.get("tracks", ()):
+            yield "tracks", _track_row(track, album_id)
+    elif kind == TRACK:
+        yield "tracks", _track_row(data, data["album_id"])
+    elif kind == LYRICS:
+        yield "lyrics", data
+    elif kind == BAND_RESULT:
+        yield "band_results", data
+    elif kind == ALBUM_RESULT:
+        yield "album_results", _result_row(data)
+    elif kind == SONG_RESULT:
+        yield "song_results", _result_row(data)
+    else:
+        raise ValueError(f"Unknown kind: {kind}")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class Exporter:
+    """
+    Base class of the exporters
+
+    Exporters are context managers: the output is complete once they are
+    closed.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, item: Exportable) -> None:
+        """
+        Write an entity
+
+        Args:
+            item: A crawl record, a band, album, track or lyrics, or a search
+                result
+        """
+        kind, data = to_record(item)
+        self._write(kind, data)
+        self.count += 1
+
+    def write_all(self, items: Iterable[Exportable]) -> int:
+        """
+        Write entities as they are produced
+
+        Args:
+            items: The entities, e.g. the records of a crawl
+
+        Returns:
+            int: The number of entities written so far
+        """
+        for item in items:
+            self.write(item)
+        return self.count
+
+    def close(self) -> None:
+        """Flush the pending rows and close the output"""
+
+    def _write(self, kind: str, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class JsonLinesExporter(Exporter):
+    """
+    Write entities as JSON Lines, one nested document per line
+
+    Each document has a "kind" key in addition to the fields of the entity.
+    Dates are written in ISO 8601 format.
+
+    Args:
+        output: The path of the file, or a text file opened for writing
+    """
+
+    def __init__(self, output: Union[str, os.PathLike, IO[str]]):
+        super().__init__()
+        if isinstance(output, (str, os.PathLike)):
+            # pylint: disable-next=consider-using-with
+            self._file = open(output, "w", encoding="utf-8")
+            self._owned = True
+        else:
+            self._file = output
+            self._owned = False
+
+    def _write(self, kind: str, data: Dict[str, Any]) -> None:
+        document = {"kind": kind, **data}
+        self._file.write(
+            json.dumps(document, default=_json_default, ensure_ascii=False)
+        )
+        self._file.write("\n")
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class _BatchExporter(Exporter):
+    """
+    Exporter buffering the rows of each table and writing them in batches
+
+    Args:
+        batch_size: Number of rows of a table buffered before they are written
+    """
+
+    def __init__(self, batch_size: int = EXPORT_BATCH_SIZE):
+        super().__init__()
+        self.batch_size = max(batch_size, 1)
+        self._batches: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _write(self, kind: str, data: Dict[str, Any]) -> None:
+        for table, row in normalize(kind, data):
+            batch = self._batches.setdefault(table, [])
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._flush(table, batch)
+                batch.clear()
+
+    def flush(self) -> None:
+        """Write the pending rows of every table"""
+        for table, batch in self._batches.items():
+            if batch:
+                self._flush(table, batch)
+                batch.clear()
+
+    def _flush(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+
+class SQLiteExporter(_BatchExporter):
+    """
+    Write entities to the normalized tables of a SQLite database
+
+    Rows are upserted, so exporting an entity again (e.g. after resuming a
+    crawl) replaces its previous rows. The tracks and bands of an album
+    exported again replace all its previous ones, including those it no
+    longer has. Lists are stored as JSON arrays and dates in ISO 8601 format.
+
+    Args:
+        path: The path of the database
+        batch_size: Number of rows of a table written per transaction
+    """
+
+    def __init__(
+        self, path: Union[str, os.PathLike], batch_size: int = EXPORT_BATCH_SIZE
+    ):
+        super().__init__(batch_size)
+        self.path = path
+        # IDs of the albums whose previous rows of each part table are
+        # still to be deleted
+        self._replaced: Dict[str, Set[str]] = {table: set() for table in _ALBUM_PARTS}
+        self._db = sqlite3.connect(path)
+        with self._db:
+            for table, columns in _TABLES.items():
+                definitions = ", ".join(
+                    f"{name} {'INTEGER' if kind == _INTEGER else 'TEXT'}"
+                    for name, kind in columns
+                )
+                key = ", ".join(_PRIMARY_KEYS[table])
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    f"({definitions}, PRIMARY KEY ({key}))"
+                )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS tracks_album ON tracks (album_id)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS album_bands_band "
+                "ON album_bands (band_id)"
+            )
+
+    def __repr__(self):
+        return f"<SQLiteExporter: {self.path}>"
+
+    @staticmethod
+    def _value(kind: str, value):
+        if value is None:
+            return None
+        if kind == _LIST:
+            return json.dumps(value, ensure_ascii=False)
+        if kind == _TIMESTAMP:
+            return value.isoformat()
+        return value
+
+    def _write(self, kind: str, data: Dict[str, Any]) -> None:
+        if kind == ALBUM:
+            album_id = data["id"]
+            for table in _ALBUM_PARTS:
+                self._replaced[table].add(album_id)
+                batch = self._batches.get(table)
+                if batch:
+                    batch[:] = [row for row in batch if row["album_id"] != album_id]
+        super()._write(kind, data)
+
+    def _delete_replaced(self, table: str) -> None:
+        """Delete the previous rows of the albums written again"""
+        replaced = self._replaced.get(table)
+        if replaced:
+            self._db.executemany(
+                f"DELETE FROM {table} WHERE album_id = ?",
+                ((album_id,) for album_id in replaced),
+            )
+            replaced.clear()
+
+    def flush(self) -> None:
+        super().flush()
+        with self._db:
+            for table in _ALBUM_PARTS:
+                self._delete_replaced(table)
+
+    def _flush(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        columns = _TABLES[table]
+        names = ", ".join(name for name, _ in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        with self._db:
+            self._delete_replaced(table)
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({placeholders})",
+                (
+                    tuple(self._value(kind, row.get(name)) for name, kind in columns)
+                    for row in rows
+                ),
+            )
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+
+class ParquetExporter(_BatchExporter):
+    """
+    Write entities to one Parquet file per normalized table
+
+    Each batch of rows becomes a row group of the file of its table, e.g.
+    `bands.parquet`. Files are only created for tables with rows. Requires
+    pyarrow, installed with the `parquet` extra.
+
+    Args:
+        directory: The directory of the files, created if needed
+        batch_size: Number of rows of a table per row group
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ):
+        try:
+            # Imported here to keep pyarrow optional
+            import pyarrow  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow: pip install metallum[parquet]"
+            ) from e
+
+        super().__init__(batch_size)
+        self.directory = directory
+        self._pa = pyarrow
+        self._writers: Dict[str, Any] = {}
+        types = {
+            _TEXT: pyarrow.string(),
+            _INTEGER: pyarrow.int64(),
+            _TIMESTAMP: pyarrow.timestamp("us"),
+            _LIST: pyarrow.list_(pyarrow.string()),
+        }
+        self._schemas = {
+            table: pyarrow.schema([(name, types[kind]) for name, kind in columns])
+            for table, columns in _TABLES.items()
+        }
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"<ParquetExporter: {self.directory}>"
+
+    def _flush(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        schema = self._schemas[table]
+        writer = self._writers.get(table)
+        if writer is None:
+            path = os.path.join(self.directory, f"{table}.parquet")
+            writer = self._writers[table] = self._pa.parquet.ParquetWriter(path, schema)
+        writer.write_table(self._pa.Table.from_pylist(rows, schema=schema))
+
+    def close(self) -> None:
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+def export_jsonl(
+    items: Iterable[Exportable], output: Union[str, os.PathLike, IO[str]]
+) -> int:
+    """
+    Write entities as JSON Lines as they are produced
+
+    Args:
+        items: The entities, e.g. the records of a crawl
+        output: The path of the file, or a text file opened for writing
+
+    Returns:
+        int: The number of entities written
+    """
+    with JsonLinesExporter(output) as exporter:
+        return exporter.write_all(items)
+
+
+def export_sqlite(
+    items: Iterable[Exportable],
+    path: Union[str, os.PathLike],
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """
+    Write entities to the normalized tables of a SQLite database as they are
+    produced
+
+    Args:
+        items: The entities, e.g. the records of a crawl
+        path: The path of the database
+        batch_size: Number of rows of a table written per transaction
+
+    Returns:
+        int: The number of entities written
+    """
+    with SQLiteExporter(path, batch_size) as exporter:
+        return exporter.write_all(items)
+
+
+def export_parquet(
+    items: Iterable[Exportable],
+    directory: Union[str, os.PathLike],
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """
+    Write entities to one Parquet file per normalized table as they are
+    produced
+
+    Args:
+        items: The entities, e.g. the records of a crawl
+        directory: The directory of the files, created if needed
+        batch_size: Number of rows of a table per row group
+
+    Returns:
+        int: The number of entities written
+    """
+    with ParquetExporter(directory, batch_size) as exporter:
+        return exporter.write_all(items)
@@ -0,0 +1,116 @@
+"""Identity map of the model objects created by a client"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from metallum.consts import IDENTITY_MAP_SIZE
+
+
+class IdentityMap:
+    """
+    Thread-safe map of entity keys to the live objects representing them
+
+    The `maxsize` most recently used objects are kept alive by the map.
+    Older ones are only referenced weakly: they still resolve to the same
+    object as long as the application holds on to them.
+
+    Args:
+        maxsize: Number of objects kept alive by the map
+    """
+
+    def __init__(self, maxsize: int = IDENTITY_MAP_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._recent: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._live: "weakref.WeakValueDictionary[Hashable, Any]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"<IdentityMap: {len(self)} objects>"
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, key):
+        return key in self._live
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get the object of a key
+
+        Args:
+            key: The key of the object
+
+        Returns:
+            The object, or None if there is no live object for the key
+        """
+        with self._lock:
+            obj = self._live.get(key)
+            if obj is not None:
+                self._keep(key, obj)
+            return obj
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get the object of a key, creating it if needed
+
+        Args:
+            key: The key of the object
+            factory: Function creating the object
+
+        Returns:
+            The object of the key
+        """
+        with self._lock:
+            obj = self.get(key)
+            if obj is None:
+                obj = self._live[key] = factory()
+                self._keep(key, obj)
+            return obj
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Forget the object of a key, if any
+
+        Args:
+            key: The key of the object
+        """
+        with self._lock:
+            self._recent.pop(key, None)
+            self._live.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every object"""
+        with self._lock:
+            self._recent.clear()
+            self._live.clear()
+
+    def _keep(self, key: Hashable, obj: Any) -> None:
+        self._recent[key] = obj
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.maxsize:
+            self._recent.popitem(last=False)
+
+
+def resolve(client, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    Get the object of a key from the identity map of a client, or create a new
+    one if the client has no identity map
+
+    Args:
+        client: The client
+        key: The key of the object
+        factory: Function creating the object
+
+    Returns:
+        The object of the key
+    """
+    identity_map = getattr(client, "identity_map", None)
+    if identity_map is None:
+        return factory()
+    return identity_map.get_or_create(key, factory)
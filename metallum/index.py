@@ -0,0 +1,390 @@
+"""Local full-text and faceted index of bands, albums and lyrics
+
+The index is a SQLite database with the normalized tables of
+`metallum.export`, plus SQLite FTS5 full-text indexes of the band names,
+album titles and lyrics. It is populated from fetched entities or crawl
+records, or built over an existing SQLite export, and then answers name
+searches and facet counts without any request to the site.
+"""
+
+import difflib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from metallum.consts import EXPORT_BATCH_SIZE, FUZZY_CUTOFF
+from metallum.export import SQLiteExporter
+
+# Full-text index of each table: (table, indexed column)
+_FULL_TEXT = {
+    "bands": "name",
+    "albums": "title",
+    "lyrics": "lyrics",
+}
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE {table}_fts USING fts5(
+    {column}, content='{table}', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE {table}_terms USING fts5vocab({table}_fts, 'row');
+CREATE TRIGGER {table}_ai AFTER INSERT ON {table} BEGIN
+    INSERT INTO {table}_fts (rowid, {column}) VALUES (new.rowid, new.{column});
+END;
+CREATE TRIGGER {table}_ad AFTER DELETE ON {table} BEGIN
+    INSERT INTO {table}_fts ({table}_fts, rowid, {column})
+    VALUES ('delete', old.rowid, old.{column});
+END;
+CREATE TRIGGER {table}_au AFTER UPDATE ON {table} BEGIN
+    INSERT INTO {table}_fts ({table}_fts, rowid, {column})
+    VALUES ('delete', old.rowid, old.{column});
+    INSERT INTO {table}_fts (rowid, {column}) VALUES (new.rowid, new.{column});
+END;
+INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild');
+"""
+
+# Facets of each table: the SQL expression of the facet, and the table it
+# is read from
+_FACETS = {
+    "bands": {
+        "country": ("bands.country", "bands"),
+        "genre": ("genre.value", "bands, json_each(bands.genres) AS genre"),
+        "year": ("bands.formed_in", "bands"),
+    },
+    "albums": {
+        "type": ("albums.type", "albums"),
+        "year": ("substr(albums.date, 1, 4)", "albums"),
+    },
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def _query(query: Optional[str]) -> Optional[str]:
+    """A query without any word matches everything"""
+    if query is None or not _WORD.search(query):
+        return None
+    return query
+
+
+class Index(SQLiteExporter):
+    """
+    Local full-text and faceted index
+
+    Entities are added like to an exporter, with `write` or `write_all`.
+    Searches match every word of the query, either as a prefix of a word of
+    the name (so "iron maid" finds "Iron Maiden") or, if `fuzzy` is set, as
+    a word close to it (so "metalica" finds "Metallica"). Close words must
+    start with the same letter, or have their first two letters swapped.
+    Case and diacritics are ignored.
+
+    Args:
+        path: The path of the database, in memory by default. The tables of
+            an existing SQLite export are indexed when it is opened.
+        batch_size: Number of rows of a table written per transaction
+
+    Examples:
+        >>> with Index() as index:
+        ...     index.write(band_for_id("125"))
+        ...     index.search_bands("metall")[0]["name"]
+        'Metallica'
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike] = ":memory:",
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ):
+        super().__init__(path, batch_size)
+        # Rows replaced by an upsert are deleted from the full-text indexes
+        self._db.execute("PRAGMA recursive_triggers = ON")
+        existing = {
+            row[0]
+            for row in self._db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        with self._db:
+            for table, column in _FULL_TEXT.items():
+                if f"{table}_fts" not in existing:
+                    self._db.executescript(
+                        _FTS_SCHEMA.format(table=table, column=column)
+                    )
+
+    def __repr__(self):
+        return f"<Index: {self.path}>"
+
+    def _close_terms(self, table: str, word: str) -> List[str]:
+        """
+        Find the terms of a full-text index close to a word
+
+        Only the terms starting with the first or the second letter of the
+        word (e.g. when a typo swapped them) are compared with it, and only
+        those whose length allows them to be close enough, so that large
+        indexes aren't read whole.
+
+        Returns:
+            List[str]: The closest terms, best first
+        """
+        # A ratio of FUZZY_CUTOFF bounds the length of the matching terms
+        sql = (
+            f"SELECT term FROM {table}_terms WHERE term >= ? AND term < ? "
+            "AND length(term) * ? >= ? AND length(term) * ? <= ?"
+        )
+        low, high = len(word) * FUZZY_CUTOFF, len(word) * (2 - FUZZY_CUTOFF)
+        candidates = []
+        for letter in dict.fromkeys(word[:2]):
+            params = (letter, chr(ord(letter) + 1), 2 - FUZZY_CUTOFF, low)
+            rows = self._db.execute(sql, params + (FUZZY_CUTOFF, high))
+            candidates.extend(row[0] for row in rows)
+        return difflib.get_close_matches(word, candidates, n=5, cutoff=FUZZY_CUTOFF)
+
+    def _match(self, table: str, query: str, prefix: bool, fuzzy: bool) -> str:
+        """
+        Build the full-text query matching every word of `query`
+
+        Returns:
+            str: The FTS5 query
+        """
+        terms = []
+        for word in _WORD.findall(query.lower()):
+            alternatives = [f'"{word}"' + ("*" if prefix else "")]
+            if fuzzy:
+                close = self._close_terms(table, word)
+                alternatives.extend(f'"{term}"' for term in close)
+            terms.append(f"({' OR '.join(alternatives)})")
+        return " AND ".join(terms)
+
+    def _rows(self, sql: str, params) -> List[Dict[str, Any]]:
+        cursor = self._db.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        rows = []
+        for values in cursor:
+            row = dict(zip(names, values))
+            for key in ("genres", "themes"):
+                if row.get(key) is not None:
+                    row[key] = json.loads(row[key])
+            rows.append(row)
+        return rows
+
+    def _filter(
+        self,
+        table: str,
+        query: Optional[str],
+        prefix: bool,
+        fuzzy: bool,
+        filters: Dict[str, Any],
+    ) -> Tuple[List[str], List[Any]]:
+        """
+        Build the conditions selecting the rows of a table
+
+        Returns:
+            tuple: The SQL conditions and their parameters
+        """
+        self.flush()
+        conditions, params = [], []
+        if query is not None:
+            conditions.append(f"{table}_fts MATCH ?")
+            params.append(self._match(table, query, prefix, fuzzy))
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name == "genre":
+                # Genres match as substrings, e.g. "death" matches
+                # "Melodic Death Metal"
+                conditions.append(
+                    "EXISTS (SELECT 1 FROM json_each(bands.genres) AS genre "
+                    "WHERE genre.value LIKE ?)"
+                )
+                params.append(f"%{value}%")
+            elif name == "band_id":
+                conditions.append(
+                    "albums.id IN (SELECT album_id FROM album_bands WHERE band_id = ?)"
+                )
+                params.append(str(value))
+            else:
+                expression = _FACETS[table][name][0]
+                conditions.append(f"{expression} = ? COLLATE NOCASE")
+                params.append(str(value))
+        return conditions, params
+
+    def _search(
+        self,
+        table: str,
+        order: str,
+        query: Optional[str],
+        prefix: bool,
+        fuzzy: bool,
+        limit: Optional[int],
+        filters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        query = _query(query)
+        conditions, params = self._filter(table, query, prefix, fuzzy, filters)
+        sql = f"SELECT {table}.* FROM {table}"
+        if query is not None:
+            sql += f" JOIN {table}_fts ON {table}_fts.rowid = {table}.rowid"
+            order = f"{table}_fts.rank, {order}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(-1 if limit is None else limit)
+        return self._rows(sql, params)
+
+    def search_bands(
+        self,
+        name: Optional[str] = None,
+        genre: Optional[str] = None,
+        country: Optional[str] = None,
+        year=None,
+        prefix: bool = True,
+        fuzzy: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the bands of the index
+
+        Args:
+            name: Words of the band's name
+            genre: Part of one of the band's genres
+            country: The band's country
+            year: The year the band was formed in
+            prefix: Whether the words may be the beginning of words of the name
+            fuzzy: Whether words close to the words of the name match too
+            limit: Maximum number of bands to return
+
+        Returns:
+            List[dict]: The fields of the bands, best matches first
+        """
+        filters = {"genre": genre, "country": country, "year": year}
+        return self._search("bands", "bands.name", name, prefix, fuzzy, limit, filters)
+
+    def search_albums(
+        self,
+        title: Optional[str] = None,
+        type: Optional[str] = None,  # pylint: disable=redefined-builtin
+        year=None,
+        band_id: Optional[str] = None,
+        prefix: bool = True,
+        fuzzy: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the albums of the index
+
+        Args:
+            title: Words of the album's title
+            type: The album's type (e.g. "Full-length")
+            year: The year the album was released in
+            band_id: The ID of one of the album's bands
+            prefix: Whether the words may be the beginning of words of the
+                title
+            fuzzy: Whether words close to the words of the title match too
+            limit: Maximum number of albums to return
+
+        Returns:
+            List[dict]: The fields of the albums, best matches first
+        """
+        filters = {"type": type, "year": year, "band_id": band_id}
+        order = "albums.date, albums.title"
+        return self._search("albums", order, title, prefix, fuzzy, limit, filters)
+
+    def search_lyrics(
+        self, text: str, prefix: bool = False, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the lyrics of the index
+
+        Args:
+            text: Words of the lyrics
+            prefix: Whether the words may be the beginning of words of the
+                lyrics
+            limit: Maximum number of tracks to return
+
+        Returns:
+            List[dict]: The track ID, track title, album ID and an excerpt of
+            the matching lyrics, best matches first
+        """
+        if _query(text) is None:
+            return []
+        self.flush()
+        return self._rows(
+            "SELECT lyrics.id, tracks.title, tracks.album_id, "
+            "snippet(lyrics_fts, 0, '[', ']', '...', 12) AS excerpt "
+            "FROM lyrics_fts JOIN lyrics ON lyrics.rowid = lyrics_fts.rowid "
+            "LEFT JOIN tracks ON tracks.id = lyrics.id "
+            "WHERE lyrics_fts MATCH ? ORDER BY lyrics_fts.rank LIMIT ?",
+            (
+                self._match("lyrics", text, prefix, False),
+                -1 if limit is None else limit,
+            ),
+        )
+
+    def _facets(
+        self,
+        table: str,
+        facet: str,
+        query: Optional[str],
+        prefix: bool,
+        fuzzy: bool,
+        filters: Dict[str, Any],
+    ) -> Dict[str, int]:
+        if facet not in _FACETS[table]:
+            raise ValueError(f"Unknown facet: {facet}")
+        expression, source = _FACETS[table][facet]
+        query = _query(query)
+        conditions, params = self._filter(table, query, prefix, fuzzy, filters)
+        sql = f"SELECT {expression}, COUNT(DISTINCT {table}.rowid) FROM {source}"
+        if query is not None:
+            sql += f" JOIN {table}_fts ON {table}_fts.rowid = {table}.rowid"
+        conditions.append(f"{expression} IS NOT NULL")
+        sql += " WHERE " + " AND ".join(conditions)
+        sql += f" GROUP BY {expression} ORDER BY 2 DESC, 1"
+        return dict(self._db.execute(sql, params).fetchall())
+
+    def band_facets(
+        self,
+        facet: str,
+        name: Optional[str] = None,
+        genre: Optional[str] = None,
+        country: Optional[str] = None,
+        year=None,
+        prefix: bool = True,
+        fuzzy: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Count the bands of each country, genre or year among those matching
+        a search
+
+        Args:
+            facet: Either "country", "genre" or "year"
+            name, genre, country, year, prefix, fuzzy: The search, see
+                `search_bands`
+
+        Returns:
+            dict: The number of bands of each value, most frequent first
+        """
+        filters = {"genre": genre, "country": country, "year": year}
+        return self._facets("bands", facet, name, prefix, fuzzy, filters)
+
+    def album_facets(
+        self,
+        facet: str,
+        title: Optional[str] = None,
+        type: Optional[str] = None,  # pylint: disable=redefined-builtin
+        year=None,
+        prefix: bool = True,
+        fuzzy: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Count the albums of each type or year among those matching a search
+
+        Args:
+            facet: Either "type" or "year"
+            title, type, year, prefix, fuzzy: The search, see `search_albums`
+
+        Returns:
+            dict: The number of albums of each value, most frequent first
+        """
+        filters = {"type": type, "year": year}
+        return self._facets("albums", facet, title, prefix, fuzzy, filters)
@@ -2,43 +2,50 @@
 
 import datetime
 import re
-from typing import List, Optional
-
-from dateutil import parser as date_parser
-from pyquery import PyQuery
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from metallum.client import get_client
+from metallum.identity_map import resolve
 from metallum.models.album_types import AlbumTypes
 from metallum.models.lyrics import Lyrics
-from metallum.models.metallum import Metallum
+from metallum.models.metallum import Metallum, Page
 from metallum.models.metallum_collection import MetallumCollection
 from metallum.models.metallum_entity import MetallumEntity
 from metallum.models.similar_artists import SimilarArtists
-from metallum.utils import offset_time, parse_duration, split_genres
+from metallum.utils import (
+    memoized_property,
+    offset_time,
+    parse_duration,
+    split_genres,
+)
+
+if TYPE_CHECKING:
+    from pyquery import PyQuery
 
 
-def _get_bands_list(page) -> List["Band"]:
+def _get_bands_list(page, client=None) -> List["Band"]:
     """
     Get a list of bands from a page
 
     Args:
         page: PyQuery object
+        client: The client used to fetch the band pages
 
     Returns:
         List[Band]
     """
     bands = []
-    for a in page.find("a"):
-        url = PyQuery(a).attr("href")
-        band_id = re.search(r"\d+$", url).group(0)
-        bands.append(Band(f"bands/_/{band_id}"))
+    for link in page.find("a").items():
+        band_id = re.search(r"\d+$", link.attr("href")).group(0)
+        bands.append(Band.for_id(band_id, client=client, name=link.text()))
     return bands
 
 
 class TrackCollection(MetallumCollection):
     """Represents a collection of tracks on Metal Archives"""
 
-    def __init__(self, url, album):
-        super().__init__(url)
+    def __init__(self, url, album, client=None, content=None, page=None):
+        super().__init__(url, client, content, page)
 
         disc = 1
         overall_number = 1
@@ -59,15 +66,38 @@ class TrackCollection(MetallumCollection):
 class Band(MetallumEntity):
     """Represents a band on Metal Archives"""
 
+    _snapshot_fields = (
+        "id",
+        "name",
+        "country",
+        "location",
+        "status",
+        "formed_in",
+        "genres",
+        "themes",
+        "label",
+        "logo",
+        "photo",
+        "added",
+        "modified",
+    )
+
     def __repr__(self):
         return f"<Band: {self.name}>"
 
-    @property
+    @staticmethod
+    def url_for(entity_id) -> str:
+        return f"bands/_/{entity_id}"
+
+    @memoized_property
     def id(self) -> str:
         """
         >>> band.id
         '125'
         """
+        match = re.search(r"\d+$", self._url)
+        if match:
+            return match.group(0)
         url = self._page(".band_name a").attr("href")
         return re.search(r"\d+$", url).group(0)
 
@@ -79,7 +109,7 @@ class Band(MetallumEntity):
         """
         return f"bands/_/{self.id}"
 
-    @property
+    @memoized_property
     def added(self) -> Optional[datetime.datetime]:
         """
         >>> type(band.added)
@@ -91,7 +121,7 @@ class Band(MetallumEntity):
         except ValueError:
             return None
 
-    @property
+    @memoized_property
     def modified(self) -> Optional[datetime.datetime]:
         """
         >>> type(band.modified)
@@ -103,7 +133,7 @@ class Band(MetallumEntity):
         except ValueError:
             return None
 
-    @property
+    @memoized_property
     def name(self) -> str:
         """
         >>> band.name
@@ -111,7 +141,7 @@ class Band(MetallumEntity):
         """
         return self._page("h1.band_name").text().strip()
 
-    @property
+    @memoized_property
     def country(self) -> str:
         """
         >>> band.country
@@ -119,7 +149,7 @@ class Band(MetallumEntity):
         """
         return self._dd_text_for_label("Country of origin:")
 
-    @property
+    @memoized_property
     def location(self) -> str:
         """
         >>> band.location
@@ -127,7 +157,7 @@ class Band(MetallumEntity):
         """
         return self._dd_text_for_label("Location:")
 
-    @property
+    @memoized_property
     def status(self) -> str:
         """
         >>> band.status
@@ -135,7 +165,7 @@ class Band(MetallumEntity):
         """
         return self._dd_text_for_label("Status:")
 
-    @property
+    @memoized_property
     def formed_in(self) -> str:
         """
         >>> band.formed_in
@@ -143,7 +173,7 @@ class Band(MetallumEntity):
         """
         return self._dd_text_for_label("Formed in:")
 
-    @property
+    @memoized_property
     def genres(self) -> List[str]:
         """
         >>> band.genres
@@ -151,7 +181,7 @@ class Band(MetallumEntity):
         """
         return split_genres(self._dd_text_for_label("Genre:"))
 
-    @property
+    @memoized_property
     def themes(self) -> List[str]:
         """
         >>> band.themes
@@ -160,7 +190,7 @@ class Band(MetallumEntity):
         """
         return self._dd_text_for_label("Themes:").split(", ")
 
-    @property
+    @memoized_property
     def label(self) -> str:
         """
         >>> band.label
@@ -168,7 +198,7 @@ class Band(MetallumEntity):
         """
         return self._dd_text_for_label("Current label:")
 
-    @property
+    @memoized_property
     def logo(self) -> Optional[str]:
         """
         >>> band.logo
@@ -179,7 +209,7 @@ class Band(MetallumEntity):
             return None
         return url.split("?")[0]
 
-    @property
+    @memoized_property
     def photo(self) -> Optional[str]:
         """
         >>> band.photo
@@ -190,7 +220,7 @@ class Band(MetallumEntity):
             return None
         return url.split("?")[0]
 
-    @property
+    @memoized_property
     def albums(self) -> List["AlbumCollection"]:
         """
         >>> len(band.albums) > 0
@@ -199,10 +229,17 @@ class Band(MetallumEntity):
         >>> type(band.albums[0])
         <class '__main__.AlbumWrapper'>
         """
-        url = f"band/discography/id/{self.id}/tab/all"
-        return AlbumCollection(url)
+        return AlbumCollection(self._albums_url, client=self._client)
 
     @property
+    def _albums_url(self) -> str:
+        return f"band/discography/id/{self.id}/tab/all"
+
+    @property
+    def _similar_artists_url(self) -> str:
+        return f"band/ajax-recommendations/id/{self.id}/showMoreSimilar/1"
+
+    @memoized_property
     def similar_artists(self) -> "SimilarArtists":
         """
         Get a list of similar artists to the current band.
@@ -215,9 +252,9 @@ class Band(MetallumEntity):
             Church (105) | Heathen (105) | Flotsam and Jetsam (104) | Slayer
             ...
         """
-
-        url = "band/ajax-recommendations/id/" + self.id + "/showMoreSimilar/1"
-        return SimilarArtists(url, SimilarArtistsResult)
+        return SimilarArtists(
+            self._similar_artists_url, SimilarArtistsResult, client=self._client
+        )
 
 
 class Track:
@@ -232,7 +269,25 @@ class Track:
     def __repr__(self):
         return f"<Track: {self.title} ({self.duration})>"
 
-    @property
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of all the fields of the track
+
+        Returns:
+            dict: The fields of the track, keyed by name
+        """
+        return {
+            "id": self.id,
+            "number": self.number,
+            "overall_number": self.overall_number,
+            "disc_number": self.disc_number,
+            "title": self.title,
+            "full_title": self.full_title,
+            "duration": self.duration,
+            "band": {"id": self.band.id, "name": self.band.name},
+        }
+
+    @memoized_property
     def id(self) -> str:
         """
         >>> track.id
@@ -240,7 +295,7 @@ class Track:
         """
         return self._elem("td").eq(0)("a").attr("name")
 
-    @property
+    @memoized_property
     def number(self) -> int:
         """
         >>> track.number
@@ -282,7 +337,7 @@ class Track:
         """
         return self._disc_number
 
-    @property
+    @memoized_property
     def full_title(self) -> str:
         """
         >>> track.full_title
@@ -293,7 +348,7 @@ class Track:
         """
         return self._elem("td").eq(1).text().replace("\n", "").replace("\t", "")
 
-    @property
+    @memoized_property
     def title(self) -> str:
         """
         >>> track.title
@@ -304,11 +359,11 @@ class Track:
         """
         title = self.full_title
         # Remove band name from split album track titles
-        if self.album.type == AlbumTypes.SPLIT:
+        if self.album.type == AlbumTypes.SPLIT.value:
             title = title[len(self.band.name) + 3 :]
         return title
 
-    @property
+    @memoized_property
     def duration(self) -> int:
         """
         >>> track.duration
@@ -321,7 +376,7 @@ class Track:
             seconds = 0
         return seconds
 
-    @property
+    @memoized_property
     def band(self) -> Band:
         """
         >>> track.band
@@ -330,7 +385,7 @@ class Track:
         >>> split_album_track.band
         <Band: Lunar Aurora>
         """
-        if self.album.type == AlbumTypes.SPLIT:
+        if self.album.type == AlbumTypes.SPLIT.value:
             for band in self.album.bands:
                 if self.full_title.startswith(band.name):
                     break
@@ -338,27 +393,74 @@ class Track:
             band = self.album.bands[0]
         return band
 
-    @property
+    @memoized_property
+    def has_lyrics(self) -> bool:
+        """
+        Whether the lyrics of the track are on the site (they are not for
+        instrumental tracks, or when nobody added them yet)
+
+        >>> track.has_lyrics
+        True
+        """
+        return bool(self._elem("a[id^='lyricsButton']"))
+
+    @memoized_property
     def lyrics(self) -> "Lyrics":
         """
         >>> str(track.lyrics).split('\\n')[0]
         'Lashing out the action, returning the reaction'
         """
-        return Lyrics(self.id)
+        return Lyrics(self.id, client=self.album._client)
 
 
 class Album(MetallumEntity):
     """Represents an album on Metal Archives"""
 
+    _snapshot_fields = (
+        "id",
+        "title",
+        "type",
+        "date",
+        "label",
+        "score",
+        "review_count",
+        "duration",
+        "cover",
+        "added",
+        "modified",
+        "bands",
+    )
+
+    def _snapshot_value(self, field: str) -> Any:
+        if field == "bands":
+            return [{"id": band.id, "name": band.name} for band in self.bands]
+        return super()._snapshot_value(field)
+
+    def _from_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        fields = super()._from_snapshot(snapshot)
+        if "bands" in snapshot:
+            fields["bands"] = [
+                Band.for_id(band["id"], client=self._client, name=band["name"])
+                for band in snapshot["bands"]
+            ]
+        return fields
+
     def __repr__(self):
         return f"<Album: {self.title}>"
 
-    @property
+    @staticmethod
+    def url_for(entity_id) -> str:
+        return f"albums/_/_/{entity_id}"
+
+    @memoized_property
     def id(self) -> str:
         """
         >>> album.id
         '547'
         """
+        match = re.search(r"\d+$", self._url)
+        if match:
+            return match.group(0)
         url = self._page(".album_name a").attr("href")
         return re.search(r"\d+$", url).group(0)
 
@@ -370,7 +472,7 @@ class Album(MetallumEntity):
         """
         return f"albums/_/_/{self.id}"
 
-    @property
+    @memoized_property
     def bands(self) -> List[Band]:
         """Return a list of band objects. The list will only contain
         multiple bands when the album is of type 'Split'.
@@ -382,9 +484,9 @@ class Album(MetallumEntity):
         [<Band: Lunar Aurora>, <Band: Paysage d'Hiver>]
         """
         page = self._page(".band_name")
-        return _get_bands_list(page)
+        return _get_bands_list(page, self._client)
 
-    @property
+    @memoized_property
     def added(self) -> Optional[datetime.datetime]:
         """
         >>> type(album.added)
@@ -396,7 +498,7 @@ class Album(MetallumEntity):
         except ValueError:
             return None
 
-    @property
+    @memoized_property
     def modified(self) -> Optional[datetime.datetime]:
         """
         >>> type(album.modified)
@@ -408,7 +510,7 @@ class Album(MetallumEntity):
         except ValueError:
             return None
 
-    @property
+    @memoized_property
     def title(self) -> str:
         """
         >>> album.title
@@ -416,7 +518,7 @@ class Album(MetallumEntity):
         """
         return self._page("h1.album_name a").text()
 
-    @property
+    @memoized_property
     def type(self) -> str:
         """
         >>> album.type
@@ -425,18 +527,17 @@ class Album(MetallumEntity):
         element = self._dd_element_for_label("Type:")
         return element.text() if element else ""
 
-    @property
+    @memoized_property
     def duration(self) -> int:
         """
         >>> album.duration
         3290
         """
-        s = self._page("table.table_lyrics td strong").text()
-        if s:
-            return parse_duration(s)
-        return 0
+        # Albums with several discs have one total per disc
+        totals = self._page("table.table_lyrics td strong").items()
+        return sum(parse_duration(total.text()) for total in totals if total.text())
 
-    @property
+    @memoized_property
     def date(self) -> Optional[datetime.datetime]:
         """
         >>> album.date
@@ -448,10 +549,13 @@ class Album(MetallumEntity):
         if len(s) > 4 and "," not in s:
             date = datetime.datetime.strptime(s, "%B %Y")
         else:
-            date = date_parser.parse(s)
+            # Imported here to keep `import metallum` cheap
+            from dateutil import parser  # pylint: disable=import-outside-toplevel
+
+            date = parser.parse(s)
         return date
 
-    @property
+    @memoized_property
     def year(self) -> int:
         """
         >>> album.year
@@ -459,7 +563,7 @@ class Album(MetallumEntity):
         """
         return int(self.date.year)
 
-    @property
+    @memoized_property
     def label(self) -> str:
         """
         >>> album.label
@@ -471,10 +575,10 @@ class Album(MetallumEntity):
         element = self._dd_element_for_label("Label:")
         return element("a").text() if element else ""
 
-    def _review_element(self) -> Optional[PyQuery]:
+    def _review_element(self) -> Optional["PyQuery"]:
         return self._dd_element_for_label("Reviews:")
 
-    @property
+    @memoized_property
     def score(self) -> Optional[int]:
         """
         >>> album.score
@@ -496,7 +600,7 @@ class Album(MetallumEntity):
 
         return int(score.group(1))
 
-    @property
+    @memoized_property
     def review_count(self) -> Optional[int]:
         """
         >>> album.review_count
@@ -518,7 +622,7 @@ class Album(MetallumEntity):
 
         return int(count.group(1))
 
-    @property
+    @memoized_property
     def cover(self) -> Optional[str]:
         """
         >>> album.cover
@@ -533,12 +637,12 @@ class Album(MetallumEntity):
 class AlbumCollection(MetallumCollection):
     """Represents a collection of albums on Metal Archives"""
 
-    def __init__(self, url):
-        super().__init__(url)
+    def __init__(self, url, client=None, content=None):
+        super().__init__(url, client, content)
 
         rows = self._page("tr:gt(0)")
         for index in range(len(rows)):
-            self.append(AlbumWrapper(elem=rows.eq(index)))
+            self.append(AlbumWrapper(elem=rows.eq(index), client=self._client))
 
 
 class AlbumWrapper(Metallum):
@@ -555,32 +659,100 @@ class AlbumWrapper(Metallum):
 
     >>> type(a._album)
     <class '__main__.Album'>
+
+    The album and its tracklist share a single fetched and parsed page.
     """
 
-    def __init__(self, url=None, elem=None):
+    def __init__(self, url=None, elem=None, client=None, content=None):
         if url:
-            super().__init__(url)
-            self._album = Album(url)
+            super().__init__(url, client, content)
+            match = re.search(r"\d+$", url)
+            if match:
+                self._album = Album.for_id(
+                    match.group(0), client=self._client, page=self._source
+                )
+                self._source = self._album._source
+            else:
+                self._album = Album(url, client=self._client, page=self._source)
         elif elem:
+            self._client = client or get_client()
             self._album = LazyAlbum(elem)
 
+    @classmethod
+    def for_id(cls, album_id, client=None, content=None) -> "AlbumWrapper":
+        """
+        Get the album with the given ID. If the client has an identity map,
+        the same object is returned for the same ID.
+
+        Args:
+            album_id: The ID of the album
+            client: The client used to fetch the page
+            content: The page content, if it was already fetched
+
+        Returns:
+            AlbumWrapper: The album
+        """
+        client = client or get_client()
+
+        def create():
+            url = Album.url_for(album_id)
+            return cls(url=url, client=client, content=content)
+
+        return resolve(client, (cls.__name__, str(album_id)), create)
+
     def __repr__(self):
         return f"<Album: {self.title} ({self.type})>"
 
     def __getattr__(self, name):
         if not hasattr(self._album, name) and hasattr(Album, name):
-            self._album = Album(self._album.url)
+            self._album = Album.for_id(self._album.id, client=self._client)
         return getattr(self._album, name)
 
     @property
+    def _album_entity(self) -> "Album":
+        """The full album, created from the lazy album if needed"""
+        if not isinstance(self._album, Album):
+            self._album = Album.for_id(self._album.id, client=self._client)
+        return self._album
+
+    @property
+    def _album_page(self) -> Page:
+        """The album page, shared by the album and its tracklist"""
+        return self._album_entity._source
+
+    def refresh(self) -> "AlbumWrapper":
+        """
+        Forget the album page, the tracklist and every parsed field
+
+        Returns:
+            AlbumWrapper: The album itself
+        """
+        self._memo = {}
+        if isinstance(self._album, Album):
+            self._album.refresh()
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of all the fields of the album, including its tracklist
+
+        Returns:
+            dict: The fields of the album, keyed by name
+        """
+        snapshot = self._album_entity.to_dict()
+        snapshot["tracks"] = [track.to_dict() for track in self.tracks]
+        return snapshot
+
+    @memoized_property
     def tracks(self):
         """
         >>> len(album.tracks)
         8
         """
-        return TrackCollection(self._album.url, self)
+        page = self._album_page
+        return TrackCollection(page.url, self, client=self._client, page=page)
 
-    @property
+    @memoized_property
     def disc_count(self):
         """
         >>> album.disc_count
@@ -602,7 +774,7 @@ class LazyAlbum:
     def __init__(self, elem):
         self._elem = elem
 
-    @property
+    @memoized_property
     def id(self) -> str:
         """
         >>> album.id
@@ -619,7 +791,7 @@ class LazyAlbum:
         """
         return f"albums/_/_/{self.id}"
 
-    @property
+    @memoized_property
     def title(self) -> str:
         """
         >>> album.title
@@ -627,7 +799,7 @@ class LazyAlbum:
         """
         return self._elem("td").eq(0)("a").text()
 
-    @property
+    @memoized_property
     def type(self) -> str:
         """
         >>> album.type
@@ -635,7 +807,7 @@ class LazyAlbum:
         """
         return self._elem("td").eq(1).text()
 
-    @property
+    @memoized_property
     def year(self) -> int:
         """
         >>> album.year
@@ -649,9 +821,10 @@ class SimilarArtistsResult(list):
 
     _resultType = Band
 
-    def __init__(self, details):
+    def __init__(self, details, client=None):
         super().__init__()
         self._details = details
+        self._client = client
         for d in details:
             self.append(d)
 
@@ -715,4 +888,4 @@ class SimilarArtistsResult(list):
         Returns:
             Band
         """
-        return self._resultType(self.url)
+        return self._resultType.for_id(self.id, client=self._client)
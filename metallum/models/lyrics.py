@@ -1,5 +1,7 @@
 """Lyrics model"""
 
+from typing import Any, Dict
+
 from metallum.consts import BR, CR
 from metallum.models.metallum import Metallum
 
@@ -7,8 +9,31 @@ from metallum.models.metallum import Metallum
 class Lyrics(Metallum):
     """Represents a song's lyrics page"""
 
-    def __init__(self, lyrics_id):
-        super().__init__(f"release/ajax-view-lyrics/id/{lyrics_id}")
+    def __init__(self, lyrics_id, client=None, content=None):
+        super().__init__(self.url_for(lyrics_id), client, content)
+        self.id = str(lyrics_id)
+
+    @staticmethod
+    def url_for(lyrics_id) -> str:
+        """
+        Get the URL of the lyrics page
+
+        Args:
+            lyrics_id: The lyrics' ID
+
+        Returns:
+            str: The URL of the lyrics page
+        """
+        return f"release/ajax-view-lyrics/id/{lyrics_id}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of the lyrics
+
+        Returns:
+            dict: The ID of the lyrics and their text
+        """
+        return {"id": self.id, "lyrics": str(self)}
 
     def __str__(self):
         lyrics = self._page("p").html()
@@ -1,52 +1,91 @@
 """Base class for all Metallum classes"""
 
-import time
+from typing import TYPE_CHECKING
 
-import requests_cache
-from pyquery import PyQuery
+from metallum.client import get_client
 
-from metallum.consts import CACHE_FILE, REQUEST_TIMEOUT
-from metallum.utils import make_absolute, get_user_agent
+if TYPE_CHECKING:
+    from pyquery import PyQuery
+
+
+class Page:
+    """
+    A page of the site, fetched and parsed on first access
+
+    A single page can back several Metallum objects (e.g. an album and its
+    tracklist), which then share one request and one parse.
+
+    Args:
+        url: The URL of the page
+        client: The client used to fetch the page
+        content: The page content, if it was already fetched
+    """
+
+    def __init__(self, url, client, content=None):
+        self.url = url
+        self._client = client
+        self._content = content
+        self._document = None
+
+    def __repr__(self):
+        return f"<Page: {self.url}>"
+
+    @property
+    def content(self) -> str:
+        """The page content"""
+        if self._content is None:
+            self._content = self._client.fetch(self.url)
+        return self._content
+
+    @property
+    def document(self) -> "PyQuery":
+        """The parsed page"""
+        if self._document is None:
+            # Imported here to keep `import metallum` cheap
+            from pyquery import PyQuery  # pylint: disable=import-outside-toplevel
+
+            self._document = PyQuery(self.content)
+        return self._document
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the page has already been fetched"""
+        return self._content is not None
 
 
 class Metallum:
-    """Base metallum class - represents a metallum page"""
+    """
+    Base metallum class - represents a metallum page
 
-    def __init__(self, url):
-        self._session = requests_cache.CachedSession(cache_name=CACHE_FILE)
-        self._session.hooks = {"response": self._make_throttle_hook()}
-        self._session.headers = {
-            # "User-Agent": get_user_agent(),
-            "Accept-Encoding": "gzip",
-        }
+    The page is only fetched when its content is first needed.
+    """
 
-        self._content = self._fetch_page_content(url)
-        self._page = PyQuery(self._content)
+    def __init__(self, url, client=None, content=None, page=None):
+        self._client = client or get_client()
+        self._url = url
+        self._source = page or Page(url, self._client, content)
 
-    def _make_throttle_hook(self):
-        """
-        Returns a response hook function which sleeps for `timeout` seconds if
-        response is not cached
-        """
+    @property
+    def _content(self) -> str:
+        """The page content, fetched on first access"""
+        return self._source.content
 
-        def hook(response, *args, **kwargs):
-            is_cached = getattr(response, "from_cache", False)
-            if not is_cached:
-                time.sleep(REQUEST_TIMEOUT)
-            # print("{}{}".format(response.request.url, " (CACHED)" if is_cached else ""))
-            return response
+    @property
+    def _page(self) -> "PyQuery":
+        """The parsed page, parsed on first access"""
+        return self._source.document
 
-        return hook
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the page has already been fetched"""
+        return self._source.is_loaded
 
-    def _fetch_page_content(self, url) -> str:
+    def load(self) -> "Metallum":
         """
-        Fetch the page content
-
-        Args:
-            url: The URL of the page to fetch
+        Fetch the page now instead of on first access
 
         Returns:
-            str: The page content
+            Metallum: The page itself
         """
-        res = self._session.get(make_absolute(url))
-        return res.text
+        self._content  # pylint: disable=pointless-statement
+        return self
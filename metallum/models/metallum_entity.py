@@ -1,33 +1,227 @@
 """Base class for all entities on Metal Archives"""
 
-from typing import Optional
+import re
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
 
-from pyquery import PyQuery
+from metallum.client import get_client
+from metallum.identity_map import resolve
+from metallum.models.metallum import Metallum, Page
+from metallum.utils import memoized_property
 
-from metallum.models.metallum import Metallum
+if TYPE_CHECKING:
+    from pyquery import PyQuery
+
+
+def normalize_label(label: str) -> str:
+    """
+    Normalize the label of a <dt> element
+
+    Args:
+        label: The label
+
+    Returns:
+        str: The label without trailing colon and with collapsed whitespace
+
+    Examples:
+        >>> normalize_label('Country of origin:')
+        'Country of origin'
+        >>> normalize_label(' Formed  in : ')
+        'Formed in'
+    """
+    return " ".join(label.split()).rstrip(":").rstrip()
 
 
 class MetallumEntity(Metallum):
-    """Represents a metallum entity (artist, album...)"""
+    """
+    Represents a metallum entity (artist, album...)
+
+    Fields which are already known (e.g. the name of a band taken from a link
+    to it) can be passed as keyword arguments. They are returned without
+    fetching the entity page.
+
+    Fields are parsed once and then cached on the instance. If the client has
+    an object cache, the snapshot of the entity is stored there once its page
+    is parsed, and later instances of the same entity are created from it
+    without fetching nor parsing the page.
+
+    Attributes:
+        _snapshot_fields: The fields returned by `to_dict`
+    """
+
+    _snapshot_fields: Tuple[str, ...] = ()
 
-    def _dd_element_for_label(self, label: str) -> Optional[PyQuery]:
+    def __init__(self, url, client=None, content=None, page=None, **known):
+        super().__init__(url, client, content, page)
+        self._memo = dict(known)
+        self._snapshot_pending = self._object_cache is not None
+        if self._snapshot_pending and not self.is_loaded:
+            snapshot = self._object_cache.get(self._cache_key)
+            if snapshot is not None:
+                self._memo.update(self._from_snapshot(snapshot))
+                self._snapshot_pending = False
+
+    @classmethod
+    def for_id(
+        cls, entity_id, client=None, content=None, page=None, **known
+    ) -> "MetallumEntity":
         """
-        Data on entity pages are stored in <dt> / <dd> pairs
+        Get the entity with the given ID. If the client has an identity map,
+        the same object is returned for the same ID.
 
         Args:
-            label: The label to search for
+            entity_id: The ID of the entity
+            client: The client used to fetch the page
+            content: The page content, if it was already fetched
+            page: The page of the entity, if it is shared with another object
+            **known: Fields which are already known
 
         Returns:
-            PyQuery: The <dd> element corresponding to the label
+            MetallumEntity: The entity
+        """
+        client = client or get_client()
+
+        def create():
+            url = cls.url_for(entity_id)
+            return cls(url, client=client, content=content, page=page, **known)
+
+        entity = resolve(client, (cls.__name__, str(entity_id)), create)
+        for field, value in known.items():
+            entity._memo.setdefault(field, value)
+        return entity
+
+    @staticmethod
+    def url_for(entity_id) -> str:
         """
-        labels = list(self._page("dt").contents())
+        Get the URL of the entity with the given ID
 
-        try:
-            index = labels.index(label)
-        except ValueError:
-            return None
+        Args:
+            entity_id: The ID of the entity
 
-        return self._page("dd").eq(index)
+        Returns:
+            str: The URL of the entity page
+        """
+        raise NotImplementedError
+
+    @property
+    def _object_cache(self):
+        """The object cache of the client, if any"""
+        return getattr(self._client, "object_cache", None)
+
+    @property
+    def _cache_key(self) -> Optional[Tuple[str, str]]:
+        """The key of the entity in the object cache"""
+        match = re.search(r"\d+$", self._url)
+        return (type(self).__name__, match.group(0)) if match else None
+
+    @property
+    def _page(self) -> "PyQuery":
+        """The parsed page, parsed on first access"""
+        document = self._source.document
+        if self._snapshot_pending:
+            self._snapshot_pending = False
+            if self._cache_key is not None:
+                self._object_cache.put(self._cache_key, self._snapshot())
+        return document
+
+    def _from_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a snapshot taken by `to_dict` back to field values
+
+        Args:
+            snapshot: The snapshot
+
+        Returns:
+            dict: The fields of the entity, keyed by name
+        """
+        return {
+            field: list(value) if isinstance(value, list) else value
+            for field, value in snapshot.items()
+        }
+
+    def refresh(self) -> "MetallumEntity":
+        """
+        Forget the page and every parsed field. They are fetched (through the
+        client's cache) and parsed again on next access.
+
+        Returns:
+            MetallumEntity: The entity itself
+        """
+        self._memo = {}
+        self._source = Page(self._url, self._client)
+        if self._object_cache is not None:
+            self._object_cache.pop(self._cache_key)
+            self._snapshot_pending = True
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of all the fields of the entity
+
+        Returns:
+            dict: The fields of the entity, keyed by name
+        """
+        return {field: self._snapshot_value(field) for field in self._snapshot_fields}
+
+    def _snapshot_value(self, field: str) -> Any:
+        """
+        Get the value of a field as stored in a snapshot
+
+        Args:
+            field: The name of the field
+
+        Returns:
+            Any: The value of the field
+        """
+        return getattr(self, field)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """
+        Snapshot of the fields which can be parsed, for the object cache
+
+        Unlike `to_dict`, a field which fails to be parsed (e.g. a missing
+        release date) is left out instead of failing the whole snapshot. It
+        is then parsed from the page, and fails again, when it is accessed.
+
+        Returns:
+            dict: The fields of the entity, keyed by name
+        """
+        snapshot = {}
+        for field in self._snapshot_fields:
+            try:
+                snapshot[field] = self._snapshot_value(field)
+            except Exception:  # pylint: disable=broad-exception-caught
+                continue
+        return snapshot
+
+    @memoized_property
+    def fields(self) -> Mapping[str, "PyQuery"]:
+        """
+        Data on entity pages are stored in <dt> / <dd> pairs. This maps each
+        normalized <dt> label (e.g. 'Country of origin') to its <dd> element.
+
+        >>> band.fields['Status'].text()
+        'Active'
+        """
+        fields = {}
+        values = self._page("dd")
+        for index, label in enumerate(self._page("dt").items()):
+            label = normalize_label(label.text())
+            if label not in fields:
+                fields[label] = values.eq(index)
+        return MappingProxyType(fields)
+
+    def _dd_element_for_label(self, label: str) -> Optional["PyQuery"]:
+        """
+        Get the <dd> element corresponding to a <dt> label
+
+        Args:
+            label: The label to search for
+
+        Returns:
+            PyQuery: The <dd> element corresponding to the label
+        """
+        return self.fields.get(normalize_label(label))
 
     def _dd_text_for_label(self, label: str) -> str:
         """
@@ -1,57 +1,206 @@
 """Results from a search on Metal Archives"""
 
+import datetime
+import html
 import re
-from typing import List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from pyquery import PyQuery
-
-from metallum.models import Album, AlbumWrapper, Band, _get_bands_list
+from metallum.models import Album, AlbumWrapper, Band
 from metallum.models.lyrics import Lyrics
 from metallum.models.metallum import Metallum
-from metallum.utils import split_genres
+from metallum.utils import offset_time, split_genres
+
+if TYPE_CHECKING:
+    from pyquery import PyQuery
+
+
+# Cells of the aaData rows are either plain text or made of links
+_ANCHOR = re.compile(r"<a\s[^>]*?href=[\"']([^\"']*)[\"'][^>]*>(.*?)</a>", re.S)
+_LYRICS_LINK = re.compile(r'id="lyricsLink_(\d+)"')
+_TAG = re.compile(r"<[^>]*>")
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+
+Links = Tuple[Tuple[str, str], ...]
+
+
+def _parse(cell: str) -> "PyQuery":
+    """Parse a cell of a search result"""
+    # Imported here to keep `import metallum` cheap
+    from pyquery import PyQuery  # pylint: disable=import-outside-toplevel
+
+    return PyQuery(cell)
 
 
-class SearchResult(list):
+def _link_text(content: str) -> str:
+    return " ".join(html.unescape(_TAG.sub("", content)).split())
+
+
+def decode_cell(cell: str) -> Tuple[str, Links]:
+    """
+    Decode a cell of a search result
+
+    Args:
+        cell: The HTML of the cell
+
+    Returns:
+        tuple: The text of the cell, and the (URL, text) of its links
+
+    Examples:
+        >>> decode_cell('<a href="https://x/bands/AC%2FDC/7">AC/DC &amp; co</a>')
+        ('AC/DC & co', (('https://x/bands/AC%2FDC/7', 'AC/DC & co'),))
+        >>> decode_cell('<a href="javascript:;" id="lyricsLink_3449">Lyrics</a>')
+        ('3449', ())
+        >>> decode_cell('Full-length')
+        ('Full-length', ())
+    """
+    if not cell.startswith("<a href"):
+        return cell, ()
+    lyrics_link = _LYRICS_LINK.search(cell)
+    if lyrics_link is not None:
+        return lyrics_link[1], ()
+
+    links = tuple(
+        (html.unescape(url), _link_text(text)) for url, text in _ANCHOR.findall(cell)
+    )
+    if not links:
+        # Not one of the known shapes, leave it to the HTML parser
+        anchors = _parse(cell)("a")
+        links = tuple((a.attr("href"), a.text()) for a in anchors.items())
+        return anchors.text(), links
+    return " ".join(text for _, text in links), links
+
+
+def _extract_id(url: str) -> str:
+    return re.search(r"\d+$", url).group(0)
+
+
+class SearchResult:
     """
     Represents a search result in an advanced search
 
+    The cells of the row are decoded once, when the result is created, and
+    the result behaves like a read-only list of their text. The raw HTML of
+    the cells is only kept if asked for, so that large numbers of results
+    can be held in memory.
+
+    Args:
+        details: The HTML cells of the row
+        client: The client used to fetch the pages of the result
+        keep_html: Whether to keep the raw HTML of the cells
+
     Attributes:
         _resultType: The type of the result
+        _snapshot_fields: The fields returned by `to_dict`
     """
 
+    __slots__ = ("_values", "_links", "_html", "_client")
+
     _resultType = None
+    _snapshot_fields: Tuple[str, ...] = ()
 
-    def __init__(self, details):
-        super().__init__()
-        for detail in details:
-            if re.match("^<a href.*", detail):
-                lyrics_link = re.search(r'id="lyricsLink_(\d+)"', detail)
-                if lyrics_link is not None:
-                    self.append(lyrics_link[1])
-                else:
-                    d = PyQuery(detail)
-                    self.append(d("a").text())
-            else:
-                self.append(detail)
+    def __init__(self, details, client=None, keep_html=False):
+        self._client = client
+        self._html = tuple(details) if keep_html else None
+        cells = [decode_cell(detail) for detail in details]
+        self._values = tuple(value for value, _ in cells)
+        self._links = tuple(links for _, links in cells)
 
     def __repr__(self):
         s = " | ".join(self)
         return f"<SearchResult: {s}>"
 
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._values[index])
+        return self._values[index]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, SearchResult):
+            return type(self) is type(other) and self._values == other._values
+        if isinstance(other, (list, tuple)):
+            return list(self._values) == list(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((type(self).__name__, self._values))
+
+    def __getstate__(self):
+        # The client isn't pickled: unpickled results use the shared client
+        slots = {"_values": self._values, "_links": self._links, "_html": self._html}
+        return None, {**slots, "_client": None}
+
+    @property
+    def html(self) -> Optional[Tuple[str, ...]]:
+        """
+        Raw HTML of the cells of the row, if it was kept
+
+        Examples:
+            >>> search_results[0].html is None
+            True
+        """
+        return self._html
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Snapshot of all the fields of the result
+
+        Returns:
+            dict: The fields of the result, keyed by name
+        """
+        return {field: self._snapshot_value(field) for field in self._snapshot_fields}
+
+    def _snapshot_value(self, field: str) -> Any:
+        """
+        Get the value of a field as stored in a snapshot. Bands are stored as
+        their ID and name.
+
+        Args:
+            field: The name of the field
+
+        Returns:
+            Any: The value of the field
+        """
+        if field == "bands":
+            return [
+                {"id": _extract_id(url), "name": name} for url, name in self._links[0]
+            ]
+        return getattr(self, field)
+
     def get(self) -> "Metallum":
         """Return the result as a Metallum object"""
         # ! E1102: self._resultType is not callable (not-callable)
-        # ! E1101: Instance of 'SearchResult' has no 'url' member (no-member)
-        return self._resultType(self.url)
+        # ! E1101: Instance of 'SearchResult' has no 'id' member (no-member)
+        return self._resultType.for_id(self.id, client=self._client)
+
+    def _bands(self, cell: int) -> List["Band"]:
+        """
+        Get the bands linked from a cell
+
+        Args:
+            cell: The index of the cell
+
+        Returns:
+            List[Band]: The bands linked from the cell
+        """
+        return [
+            Band.for_id(_extract_id(url), client=self._client, name=name)
+            for url, name in self._links[cell]
+        ]
 
 
 class BandResult(SearchResult):
     """Represents a band search result"""
 
-    def __init__(self, details):
-        super().__init__(details)
-        self._details = details
-        self._resultType = Band
+    __slots__ = ()
+
+    _resultType = Band
+    _snapshot_fields = ("id", "name", "genres", "country")
 
     @property
     def id(self) -> str:
@@ -62,8 +211,7 @@ class BandResult(SearchResult):
             >>> search_results[0].id
             '125'
         """
-        url = PyQuery(self._details[0])("a").attr("href")
-        return re.search(r"\d+$", url).group(0)
+        return _extract_id(self._links[0][0][0])
 
     @property
     def url(self) -> str:
@@ -124,10 +272,10 @@ class BandResult(SearchResult):
 class AlbumResult(SearchResult):
     """Represents an album search result"""
 
-    def __init__(self, details):
-        super().__init__(details)
-        self._details = details
-        self._resultType = AlbumWrapper
+    __slots__ = ()
+
+    _resultType = AlbumWrapper
+    _snapshot_fields = ("id", "title", "type", "bands")
 
     @property
     def id(self) -> str:
@@ -138,8 +286,7 @@ class AlbumResult(SearchResult):
             >>> album.id
             '1'
         """
-        url = PyQuery(self._details[1])("a").attr("href")
-        return re.search(r"\d+$", url).group(0)
+        return _extract_id(self._links[1][0][0])
 
     @property
     def url(self) -> str:
@@ -183,8 +330,7 @@ class AlbumResult(SearchResult):
             >>> album.bands
             [Amorphis]
         """
-        page = PyQuery(self._details[0]).wrap("<div></div>")
-        return _get_bands_list(page)
+        return self._bands(0)
 
     @property
     def band_name(self) -> str:
@@ -201,15 +347,20 @@ class AlbumResult(SearchResult):
 class SongResult(SearchResult):
     """Represents a song search result"""
 
-    def __init__(self, details):
-        super().__init__(details)
-        self._details = details
-        self._resultType = None
+    __slots__ = ()
+
+    _snapshot_fields = ("id", "title", "type", "bands", "album", "genres")
 
     def get(self) -> "SongResult":
         """Return the result as a SongResult object"""
         return self
 
+    def _snapshot_value(self, field: str) -> Any:
+        if field == "album":
+            url, title = self._links[1][0]
+            return {"id": _extract_id(url), "title": title}
+        return super()._snapshot_value(field)
+
     @property
     def id(self) -> str:
         """
@@ -252,8 +403,7 @@ class SongResult(SearchResult):
             >>> song.bands
             [Iron Maiden]
         """
-        page = PyQuery(self._details[0]).wrap("<div></div>")
-        return _get_bands_list(page)
+        return self._bands(0)
 
     @property
     def band_name(self) -> str:
@@ -275,9 +425,8 @@ class SongResult(SearchResult):
             >>> song.album
             <Album: albums/_/_/1>
         """
-        url = PyQuery(self._details[1]).attr("href")
-        album_id = re.search(r"\d+$", url).group(0)
-        return Album(f"albums/_/_/{album_id}")
+        url, title = self._links[1][0]
+        return Album.for_id(_extract_id(url), client=self._client, title=title)
 
     @property
     def album_name(self) -> str:
@@ -313,4 +462,97 @@ class SongResult(SearchResult):
             >>> str(song.lyrics).split('\\n')[0]
             'I am a man who walks alone'
         """
-        return Lyrics(self.id)
+        return Lyrics(self.id, client=self._client)
+
+
+class ModifiedBandResult(SearchResult):
+    """
+    Represents a band of the lists of recently added or modified bands
+
+    The rows hold the band, its country, its genres and the time of the
+    change, among other cells.
+    """
+
+    __slots__ = ()
+
+    _resultType = Band
+    _snapshot_fields = ("id", "name", "country", "genres", "modified")
+
+    def _band_link(self) -> Tuple[str, str]:
+        for links in self._links:
+            for url, name in links:
+                if "/bands/" in url:
+                    return url, name
+        raise ValueError(f"No band in {self!r}")
+
+    @property
+    def id(self) -> str:
+        """
+        ID of the band
+
+        Examples:
+            >>> modified_band.id
+            '125'
+        """
+        return _extract_id(self._band_link()[0])
+
+    @property
+    def url(self) -> str:
+        """
+        URL of the band
+
+        Examples:
+            >>> modified_band.url
+            'bands/_/125'
+        """
+        return f"bands/_/{self.id}"
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the band
+
+        Examples:
+            >>> modified_band.name
+            'Metallica'
+        """
+        return self._band_link()[1]
+
+    @property
+    def country(self) -> str:
+        """
+        Country of the band
+
+        Examples:
+            >>> modified_band.country
+            'United States'
+        """
+        return self[2]
+
+    @property
+    def genres(self) -> List[str]:
+        """
+        Genres of the band
+
+        Examples:
+            >>> modified_band.genres
+            ['Thrash Metal (early)', 'Hard Rock (mid)', 'Heavy/Thrash Metal (later)']
+        """
+        return split_genres(self[3])
+
+    @property
+    def modified(self) -> Optional[datetime.datetime]:
+        """
+        Time the band was added or modified, in UTC
+
+        Examples:
+            >>> modified_band.modified
+            datetime.datetime(2024, 10, 18, 13, 30, 12)
+        """
+        for value in self:
+            match = _TIMESTAMP.search(value)
+            if match is not None:
+                return offset_time(
+                    datetime.datetime.strptime(match[0], "%Y-%m-%d %H:%M:%S")
+                )
+        return None
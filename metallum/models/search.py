@@ -1,19 +1,165 @@
 """Search model for the Metallum class."""
 
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from metallum.models.metallum import Metallum
 
 
 class Search(Metallum, list):
-    """Represents a search result"""
+    """
+    Represents a search result
 
-    def __init__(self, url, result_handler):
-        super().__init__(url)
+    The search holds a single page of results. Use `iter_results` to walk
+    through every page.
+
+    Args:
+        url: The URL of the search
+        result_handler: The type of the results
+        client: The client used to fetch the pages
+        content: The page content, if it was already fetched
+        keep_html: Whether the results keep the raw HTML of their cells
+    """
+
+    def __init__(self, url, result_handler, client=None, content=None, keep_html=False):
+        super().__init__(url, client, content)
+        self._result_handler = result_handler
+        self._keep_html = keep_html
 
         data = json.loads(self._content)
         results = data["aaData"]
         for result in results:
-            self.append(result_handler(result))
+            self.append(
+                result_handler(result, client=self._client, keep_html=keep_html)
+            )
 
         self.result_count = int(data["iTotalRecords"])
+
+    @property
+    def page_start(self) -> int:
+        """Offset of the first result of this page"""
+        query = dict(parse_qsl(urlsplit(self._url).query))
+        return int(query.get("iDisplayStart", 0))
+
+    def _page_url(self, start: int) -> str:
+        """
+        Get the URL of the page starting at result `start`
+
+        Args:
+            start: Offset of the first result of the page
+
+        Returns:
+            str: The page URL
+        """
+        parts = urlsplit(self._url)
+        query = [
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key != "iDisplayStart"
+        ]
+        query.append(("iDisplayStart", str(start)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _fetch_page(self, start: int) -> "Search":
+        return Search(
+            self._page_url(start),
+            self._result_handler,
+            self._client,
+            keep_html=self._keep_html,
+        )
+
+    def pages(
+        self,
+        max_pages: Optional[int] = None,
+        prefetch: bool = False,
+        workers: int = 1,
+    ) -> Iterator["Search"]:
+        """
+        Iterate over the pages of the search, starting with this one. Pages
+        are only fetched when the previous one has been consumed, unless
+        `prefetch` is set.
+
+        Once the first page is known, the offsets of all the other pages are
+        too, so up to `workers` of them can be fetched concurrently. Requests
+        still go through the client's rate limiter, and pages are returned in
+        order.
+
+        Args:
+            max_pages: Maximum number of pages to return
+            prefetch: Whether to fetch the following pages in the background
+                while the current one is being consumed
+            workers: Number of pages fetched concurrently when prefetching
+
+        Returns:
+            Iterator[Search]: The pages of the search
+        """
+        page_size = len(self)
+        if not page_size or (max_pages is not None and max_pages < 1):
+            return
+        offsets = range(self.page_start + page_size, self.result_count, page_size)
+        if max_pages is not None:
+            offsets = offsets[: max_pages - 1]
+
+        yield self
+        if not prefetch:
+            for start in offsets:
+                page = self._fetch_page(start)
+                if not page:
+                    return
+                yield page
+            return
+
+        starts = iter(offsets)
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            pending = deque(
+                executor.submit(self._fetch_page, start)
+                for start in islice(starts, max(workers, 1))
+            )
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    if not page:
+                        return
+                    for start in islice(starts, 1):
+                        pending.append(executor.submit(self._fetch_page, start))
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def iter_results(
+        self,
+        limit: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        prefetch: bool = False,
+        workers: int = 1,
+    ) -> Iterator:
+        """
+        Iterate over the results of every page of the search. Only one page is
+        held in memory at a time.
+
+        Args:
+            limit: Maximum number of results to return
+            max_pages: Maximum number of pages to fetch
+            prefetch: Whether to fetch the following pages in the background
+                while the current one is being consumed
+            workers: Number of pages fetched concurrently when prefetching
+
+        Returns:
+            Iterator: The search results
+
+        Examples:
+            >>> search = band_search('metallica', strict=False)
+            >>> len(list(search.iter_results(limit=300))) <= 300
+            True
+        """
+        results = (
+            result
+            for page in self.pages(max_pages, prefetch, workers)
+            for result in page
+        )
+        return islice(results, limit)
@@ -1,25 +1,21 @@
 """Similar artists tab on the band page"""
 
-from pyquery import PyQuery
-
 from metallum.models.metallum import Metallum
 
 
 class SimilarArtists(Metallum, list):
     """Entries in the similar artists tab"""
 
-    def __init__(self, url, result_handler):
-        super().__init__(url)
-        data = self._content
-
-        links_list = PyQuery(data)("a")
-        values_list = PyQuery(data)("tr")
+    def __init__(self, url, result_handler, client=None, content=None):
+        super().__init__(url, client, content)
+        links_list = self._page("a")
+        values_list = self._page("tr")
 
         # assert(len(links_list) == len(values_list) - 1)
         for i in range(0, len(links_list) - 1):
             details = [links_list[i].attrib.get("href")]
             details.extend(values_list[i + 1].text_content().split("\n")[1:-1])
-            self.append(result_handler(details))
+            self.append(result_handler(details, client=self._client))
             self.result_count = i
 
     def __repr__(self):
@@ -0,0 +1,94 @@
+"""Cache of parsed entities, sitting above the HTTP cache"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from metallum.consts import OBJECT_CACHE_SIZE, OBJECT_CACHE_TTL
+
+
+class ObjectCache:
+    """
+    Thread-safe LRU cache of entity snapshots
+
+    Entities whose snapshot is cached are served without fetching nor parsing
+    their page. Snapshots are the dicts returned by `to_dict`, keyed by
+    entity type and ID.
+
+    Args:
+        maxsize: Maximum number of snapshots kept, the least recently used
+            ones being evicted first
+        ttl: Time after which a snapshot expires, in seconds (None never
+            expires)
+    """
+
+    def __init__(
+        self, maxsize: int = OBJECT_CACHE_SIZE, ttl: Optional[float] = OBJECT_CACHE_TTL
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<ObjectCache: {len(self)}/{self.maxsize}>"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a snapshot
+
+        Args:
+            key: The key of the snapshot
+
+        Returns:
+            dict: The snapshot, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, snapshot = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def put(self, key: Hashable, snapshot: Dict[str, Any]) -> None:
+        """
+        Store a snapshot
+
+        Args:
+            key: The key of the snapshot
+            snapshot: The snapshot
+        """
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove a snapshot, if present
+
+        Args:
+            key: The key of the snapshot
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every snapshot"""
+        with self._lock:
+            self._entries.clear()
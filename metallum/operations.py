@@ -1,28 +1,37 @@
 """Operations module for the Metallum API."""
 
+from functools import partial
+from typing import Callable, Iterable, Iterator, Optional
 from urllib.parse import urlencode
 
+from metallum.bulk import BulkResult, fetch_many
 from metallum.models import AlbumWrapper, Band
 from metallum.models.lyrics import Lyrics
-from metallum.models.results import AlbumResult, BandResult, SongResult
+from metallum.models.results import (
+    AlbumResult,
+    BandResult,
+    ModifiedBandResult,
+    SongResult,
+)
 from metallum.models.search import Search
 from metallum.utils import map_params
 
 
-def band_for_id(band_id: str) -> "Band":
+def band_for_id(band_id: str, client=None) -> "Band":
     """
     Get a band by its ID.
 
     Args:
         band_id: The band's ID.
+        client: The client used to fetch the page.
 
     Returns:
         Band: The band with the given ID.
     """
-    return Band(f"bands/_/{band_id}")
+    return Band.for_id(band_id, client=client)
 
 
-def band_search(
+def band_search_url(
     name,
     strict=True,
     genre=None,
@@ -35,26 +44,15 @@ def band_search(
     label=None,
     additional_notes=None,
     page_start=0,
-) -> "Search":
+) -> str:
     """
-    Perform an advanced band search.
+    Build the URL of an advanced band search.
 
     Args:
-        name: The band's name.
-        strict: Whether the search should be strict.
-        genre: The band's genre.
-        countries: The band's countries.
-        year_created_from: The year the band was created from.
-        year_created_to: The year the band was created to.
-        status: The band's status.
-        themes: The band's themes.
-        location: The band's location.
-        label: The band's label.
-        additional_notes: Additional notes about the band.
-        page_start: The page to start the search from.
+        See `band_search`.
 
     Returns:
-        Search: The search results.
+        str: The search URL, relative to the site root.
     """
     # Create a dict from the method arguments
     params = locals()
@@ -79,25 +77,72 @@ def band_search(
     )
 
     # Build the search URL
-    url = "search/ajax-advanced/searching/bands/?" + urlencode(params, True)
+    return "search/ajax-advanced/searching/bands/?" + urlencode(params, True)
 
-    return Search(url, BandResult)
 
+def band_search(
+    name,
+    strict=True,
+    genre=None,
+    countries=None,
+    year_created_from=None,
+    year_created_to=None,
+    status=None,
+    themes=None,
+    location=None,
+    label=None,
+    additional_notes=None,
+    page_start=0,
+    client=None,
+    keep_html=False,
+) -> "Search":
+    """
+    Perform an advanced band search.
+
+    Args:
+        name: The band's name.
+        strict: Whether the search should be strict.
+        genre: The band's genre.
+        countries: The band's countries.
+        year_created_from: The year the band was created from.
+        year_created_to: The year the band was created to.
+        status: The band's status.
+        themes: The band's themes.
+        location: The band's location.
+        label: The band's label.
+        additional_notes: Additional notes about the band.
+        page_start: The page to start the search from.
+        client: The client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
+
+    Returns:
+        Search: The search results.
+    """
+    # Create a dict from the method arguments
+    params = locals()
+    client = params.pop("client")
+    keep_html = params.pop("keep_html")
+
+    return Search(
+        band_search_url(**params), BandResult, client=client, keep_html=keep_html
+    )
 
-def album_for_id(album_id: str) -> "AlbumWrapper":
+
+def album_for_id(album_id: str, client=None) -> "AlbumWrapper":
     """
     Get an album by its ID.
 
     Args:
         album_id: The album's ID.
+        client: The client used to fetch the page.
 
     Returns:
         AlbumWrapper: The album with the given ID.
     """
-    return AlbumWrapper(url=f"albums/_/_/{album_id}")
+    return AlbumWrapper.for_id(album_id, client=client)
 
 
-def album_search(
+def album_search_url(
     title,
     strict=True,
     band=None,
@@ -119,35 +164,15 @@ def album_search(
     types=None,
     page_start=0,
     formats=None,
-) -> "Search":
+) -> str:
     """
-    Perform an advanced album search
+    Build the URL of an advanced album search.
 
     Args:
-        title: The album's title.
-        strict: Whether the search should be strict.
-        band: The album's band.
-        band_strict: Whether the band search should be strict.
-        year_from: The year the album was released from.
-        year_to: The year the album was released to.
-        month_from: The month the album was released from.
-        month_to: The month the album was released to.
-        countries: The album's countries.
-        location: The album's location.
-        label: The album's label.
-        indie_label: Whether the label is an indie label.
-        genre: The album's genre.
-        catalog_number: The album's catalog number.
-        identifiers: The album's identifiers.
-        recording_info: The album's recording info.
-        version_description: The album's version description.
-        additional_notes: Additional notes about the album.
-        types: The album's types.
-        page_start: The page to start the search from.
-        formats: The album's formats.
+        See `album_search`.
 
     Returns:
-        Search: The search results.
+        str: The search URL, relative to the site root.
     """
     # Create a dict from the method arguments
     params = locals()
@@ -190,43 +215,98 @@ def album_search(
     )
 
     # Build the search URL
-    url = "search/ajax-advanced/searching/albums/?" + urlencode(params, True)
+    return "search/ajax-advanced/searching/albums/?" + urlencode(params, True)
 
-    return Search(url, AlbumResult)
 
-
-def song_search(
+def album_search(
     title,
     strict=True,
     band=None,
     band_strict=True,
-    release=None,
-    release_strict=True,
-    lyrics=None,
+    year_from=None,
+    year_to=None,
+    month_from=None,
+    month_to=None,
+    countries=None,
+    location=None,
+    label=None,
+    indie_label=False,
     genre=None,
+    catalog_number=None,
+    identifiers=None,
+    recording_info=None,
+    version_description=None,
+    additional_notes=None,
     types=None,
     page_start=0,
+    formats=None,
+    client=None,
+    keep_html=False,
 ) -> "Search":
     """
-    Perform an advanced song search
+    Perform an advanced album search
 
     Args:
-        title: The song's title.
+        title: The album's title.
         strict: Whether the search should be strict.
-        band: The song's band.
+        band: The album's band.
         band_strict: Whether the band search should be strict.
-        release: The song's release.
-        release_strict: Whether the release search should be strict.
-        lyrics: The song's lyrics.
-        genre: The song's genre.
-        types: The song's types.
+        year_from: The year the album was released from.
+        year_to: The year the album was released to.
+        month_from: The month the album was released from.
+        month_to: The month the album was released to.
+        countries: The album's countries.
+        location: The album's location.
+        label: The album's label.
+        indie_label: Whether the label is an indie label.
+        genre: The album's genre.
+        catalog_number: The album's catalog number.
+        identifiers: The album's identifiers.
+        recording_info: The album's recording info.
+        version_description: The album's version description.
+        additional_notes: Additional notes about the album.
+        types: The album's types.
         page_start: The page to start the search from.
+        formats: The album's formats.
+        client: The client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
 
     Returns:
         Search: The search results.
     """
     # Create a dict from the method arguments
     params = locals()
+    client = params.pop("client")
+    keep_html = params.pop("keep_html")
+
+    return Search(
+        album_search_url(**params), AlbumResult, client=client, keep_html=keep_html
+    )
+
+
+def song_search_url(
+    title,
+    strict=True,
+    band=None,
+    band_strict=True,
+    release=None,
+    release_strict=True,
+    lyrics=None,
+    genre=None,
+    types=None,
+    page_start=0,
+) -> str:
+    """
+    Build the URL of an advanced song search.
+
+    Args:
+        See `song_search`.
+
+    Returns:
+        str: The search URL, relative to the site root.
+    """
+    # Create a dict from the method arguments
+    params = locals()
 
     # Convert boolean value to integer
     params["strict"] = str(int(params["strict"]))
@@ -254,19 +334,182 @@ def song_search(
     )
 
     # Build the search URL
-    url = "search/ajax-advanced/searching/songs/?" + urlencode(params, True)
+    return "search/ajax-advanced/searching/songs/?" + urlencode(params, True)
 
-    return Search(url, SongResult)
 
+def song_search(
+    title,
+    strict=True,
+    band=None,
+    band_strict=True,
+    release=None,
+    release_strict=True,
+    lyrics=None,
+    genre=None,
+    types=None,
+    page_start=0,
+    client=None,
+    keep_html=False,
+) -> "Search":
+    """
+    Perform an advanced song search
 
-def lyrics_for_id(lyrics_id: int) -> "Lyrics":
+    Args:
+        title: The song's title.
+        strict: Whether the search should be strict.
+        band: The song's band.
+        band_strict: Whether the band search should be strict.
+        release: The song's release.
+        release_strict: Whether the release search should be strict.
+        lyrics: The song's lyrics.
+        genre: The song's genre.
+        types: The song's types.
+        page_start: The page to start the search from.
+        client: The client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
+
+    Returns:
+        Search: The search results.
+    """
+    # Create a dict from the method arguments
+    params = locals()
+    client = params.pop("client")
+    keep_html = params.pop("keep_html")
+
+    return Search(
+        song_search_url(**params), SongResult, client=client, keep_html=keep_html
+    )
+
+
+def lyrics_for_id(lyrics_id: int, client=None) -> "Lyrics":
     """
     Get lyrics by their ID.
 
     Args:
         id: The lyrics' ID.
+        client: The client used to fetch the page.
 
     Returns:
         Lyrics: The lyrics with the given ID.
     """
-    return Lyrics(lyrics_id)
+    return Lyrics(lyrics_id, client=client)
+
+
+def modified_bands_url(month, created=False, page_start=0) -> str:
+    """
+    Build the URL of the list of the bands modified during a month.
+
+    Args:
+        See `modified_bands`.
+
+    Returns:
+        str: The list URL, relative to the site root.
+
+    Examples:
+        >>> modified_bands_url('2024-10')
+        'archives/ajax-band/list/selection/2024-10/by/modified/json/1?iDisplayStart=0'
+    """
+    if not isinstance(month, str):
+        month = month.strftime("%Y-%m")
+    change = "created" if created else "modified"
+    params = {"iDisplayStart": page_start}
+    url = f"archives/ajax-band/list/selection/{month}/by/{change}/json/1"
+    return f"{url}?{urlencode(params)}"
+
+
+def modified_bands(
+    month, created=False, page_start=0, client=None, keep_html=False
+) -> "Search":
+    """
+    List the bands modified during a month
+
+    Args:
+        month: The month, as a "YYYY-MM" string or a date.
+        created: Whether to list the bands added during the month instead.
+        page_start: The page to start the list from.
+        client: The client used to fetch the page.
+        keep_html: Whether the results keep the raw HTML of their cells.
+
+    Returns:
+        Search: The bands, with the time of their last change.
+    """
+    url = modified_bands_url(month, created, page_start)
+    return Search(url, ModifiedBandResult, client=client, keep_html=keep_html)
+
+
+def bands_for_ids(
+    band_ids: Iterable[str],
+    workers: int = 4,
+    ordered: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+    client=None,
+) -> Iterator[BulkResult]:
+    """
+    Get many bands by their IDs, fetching their pages concurrently.
+
+    Args:
+        band_ids: The bands' IDs. Duplicates are fetched once.
+        workers: The number of pages fetched concurrently.
+        ordered: Whether to return the bands in the order of `band_ids`
+            rather than as they are fetched.
+        progress: Function called with (done, total) after each band.
+        client: The client used to fetch the pages.
+
+    Returns:
+        Iterator[BulkResult]: The band, or the error raised while fetching it,
+        for each ID.
+    """
+    fetch = partial(band_for_id, client=client)
+    return fetch_many(fetch, band_ids, workers, ordered, progress)
+
+
+def albums_for_ids(
+    album_ids: Iterable[str],
+    workers: int = 4,
+    ordered: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+    client=None,
+) -> Iterator[BulkResult]:
+    """
+    Get many albums by their IDs, fetching their pages concurrently.
+
+    Args:
+        album_ids: The albums' IDs. Duplicates are fetched once.
+        workers: The number of pages fetched concurrently.
+        ordered: Whether to return the albums in the order of `album_ids`
+            rather than as they are fetched.
+        progress: Function called with (done, total) after each album.
+        client: The client used to fetch the pages.
+
+    Returns:
+        Iterator[BulkResult]: The album, or the error raised while fetching
+        it, for each ID.
+    """
+    fetch = partial(album_for_id, client=client)
+    return fetch_many(fetch, album_ids, workers, ordered, progress)
+
+
+def lyrics_for_ids(
+    lyrics_ids: Iterable,
+    workers: int = 4,
+    ordered: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None,
+    client=None,
+) -> Iterator[BulkResult]:
+    """
+    Get many lyrics by their IDs, fetching their pages concurrently.
+
+    Args:
+        lyrics_ids: The lyrics' IDs. Duplicates are fetched once.
+        workers: The number of pages fetched concurrently.
+        ordered: Whether to return the lyrics in the order of `lyrics_ids`
+            rather than as they are fetched.
+        progress: Function called with (done, total) after each lyrics.
+        client: The client used to fetch the pages.
+
+    Returns:
+        Iterator[BulkResult]: The lyrics, or the error raised while fetching
+        them, for each ID.
+    """
+    fetch = partial(lyrics_for_id, client=client)
+    return fetch_many(fetch, lyrics_ids, workers, ordered, progress)
@@ -0,0 +1,313 @@
+"""Rate limiting for requests sent to Metal Archives"""
+
+import asyncio
+import datetime
+import email.utils
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from metallum.consts import (
+    MAX_RETRIES,
+    REQUEST_BURST,
+    REQUEST_TIMEOUT,
+    RETRY_BACKOFF,
+    RETRY_STATUS_CODES,
+)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Tokens are refilled continuously at `rate` tokens per second, up to
+    `burst` tokens. Taking a token never blocks: it reserves the next free slot
+    and returns how long the caller has to wait for it.
+
+    Args:
+        rate: Number of tokens added per second
+        burst: Maximum number of tokens the bucket can hold
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<TokenBucket: {self.rate}/s (burst {self.burst})>"
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token from the bucket
+
+        Returns:
+            float: Seconds to wait before the token may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_take(self) -> float:
+        """
+        Take a token from the bucket only if one is available now
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds to wait until
+            one is available
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """
+        Empty the bucket so that no token is available for `seconds`
+
+        Args:
+            seconds: The pause duration
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class RateLimiter:
+    """
+    Request budget shared by every client and thread
+
+    Each host gets its own token bucket. Hosts without an explicit budget use
+    the default `rate` and `burst`.
+
+    Args:
+        rate: Default number of requests per second
+        burst: Default number of requests that may be sent back to back
+        per_host: Mapping of host name to a (rate, burst) tuple
+    """
+
+    def __init__(
+        self,
+        rate: float = 1 / REQUEST_TIMEOUT,
+        burst: int = REQUEST_BURST,
+        per_host: Optional[Dict[str, Tuple[float, int]]] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._per_host = dict(per_host or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._prepaid = threading.local()
+
+    def __repr__(self):
+        return f"<RateLimiter: {self.rate}/s (burst {self.burst})>"
+
+    def bucket(self, host: str = "") -> TokenBucket:
+        """
+        Get the token bucket of a host
+
+        Args:
+            host: The host name
+
+        Returns:
+            TokenBucket: The bucket of the host
+        """
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._per_host.get(host, (self.rate, self.burst))
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def acquire(self, host: str = "") -> float:
+        """
+        Block until a request to `host` fits in the budget
+
+        Args:
+            host: The host name
+
+        Returns:
+            float: The time spent waiting, in seconds
+        """
+        prepaid = getattr(self._prepaid, "hosts", None)
+        if prepaid and prepaid.get(host):
+            prepaid[host] -= 1
+            return 0.0
+
+        delay = self.bucket(host).reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, host: str = "") -> float:
+        """
+        Wait without blocking the event loop until a request to `host` fits
+        in the budget
+
+        Args:
+            host: The host name
+
+        Returns:
+            float: The time spent waiting, in seconds
+        """
+        delay = self.bucket(host).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    @contextmanager
+    def prepaid(self, host: str = ""):
+        """
+        Let the current thread send one request to `host` without waiting,
+        because its token was already taken (e.g. by `acquire_async`)
+
+        Args:
+            host: The host name
+        """
+        if not hasattr(self._prepaid, "hosts"):
+            self._prepaid.hosts = {}
+        hosts = self._prepaid.hosts
+        before = hosts.get(host, 0)
+        hosts[host] = before + 1
+        try:
+            yield
+        finally:
+            # Drop this token if it wasn't used, but keep those of the
+            # enclosing calls
+            hosts[host] = min(hosts[host], before)
+            if not hosts[host]:
+                del hosts[host]
+
+    def pause(self, host: str, seconds: float) -> None:
+        """
+        Stop sending requests to `host` for `seconds`
+
+        Args:
+            host: The host name
+            seconds: The pause duration
+        """
+        self.bucket(host).pause(seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Args:
+        value: The header value, either a number of seconds or an HTTP date
+
+    Returns:
+        float: The number of seconds to wait, or None if it can't be parsed
+
+    Examples:
+        >>> parse_retry_after('120')
+        120.0
+        >>> parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT')
+        0.0
+        >>> parse_retry_after('soon') is None
+        True
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (date - now).total_seconds())
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """
+    Transport adapter which sends requests within the budget of a rate limiter
+
+    Responses with a status in `RETRY_STATUS_CODES` (429 Too Many Requests...)
+    are retried with exponential backoff, honouring their Retry-After header.
+    Since the HTTP cache answers hits before the transport is reached, cached
+    pages never wait for the rate limiter.
+
+    Args:
+        rate_limiter: The rate limiter to use
+        retries: Maximum number of retries for throttled responses
+        backoff: Base delay of the exponential backoff, in seconds
+        **kwargs: Arguments passed to HTTPAdapter (pool sizes...)
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        retries: int = MAX_RETRIES,
+        backoff: float = RETRY_BACKOFF,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).hostname or ""
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(host)
+            response = self._send(request, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+            if attempt >= self.retries:
+                return response
+
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = self.backoff * 2**attempt
+            self.rate_limiter.pause(host, delay)
+            response.close()
+            attempt += 1
+
+    def _send(self, request, **kwargs):
+        """Send a single request over the network"""
+        return super().send(request, **kwargs)
+
+
+_default_rate_limiter: Optional[RateLimiter] = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide rate limiter, creating it on first use
+
+    Returns:
+        RateLimiter: The shared rate limiter
+    """
+    global _default_rate_limiter  # pylint: disable=global-statement
+    if _default_rate_limiter is None:
+        with _default_rate_limiter_lock:
+            if _default_rate_limiter is None:
+                _default_rate_limiter = RateLimiter()
+    return _default_rate_limiter
@@ -0,0 +1,192 @@
+"""Record and replay the pages of the site
+
+A cassette is a JSON Lines file holding one recorded response per line, keyed
+by the path and query of its URL, so that recordings can be replayed whatever
+the host serving them (the site, or a local `metallum.standin` server).
+"""
+
+import io
+import json
+import os
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.response import HTTPResponse
+
+# Headers describing the raw transfer, which don't apply to the decoded body
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+Recording = Tuple[int, Dict[str, str], str]
+
+
+class CassetteMiss(RequestsConnectionError):
+    """Raised when a page is missing from a cassette which isn't recording"""
+
+
+def cassette_key(url: str) -> str:
+    """
+    Get the key of a URL in a cassette
+
+    Args:
+        url: The absolute URL
+
+    Returns:
+        str: The path and query of the URL
+
+    Examples:
+        >>> cassette_key('https://www.metal-archives.com/bands/_/125')
+        '/bands/_/125'
+        >>> cassette_key('http://127.0.0.1:8000/search/ajax?a=1')
+        '/search/ajax?a=1'
+    """
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class Cassette:
+    """
+    Recorded responses of the site, stored in a JSON Lines file
+
+    Recordings are appended to the file as they are made, so an interrupted
+    recording session loses nothing. When a URL is recorded several times,
+    the last recording wins.
+
+    Args:
+        path: The path of the cassette file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._recordings: Dict[str, Recording] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._recordings[entry["url"]] = (
+                            entry["status"],
+                            entry["headers"],
+                            entry["body"],
+                        )
+
+    def __repr__(self):
+        return f"<Cassette: {self.path} ({len(self)} pages)>"
+
+    def __len__(self):
+        return len(self._recordings)
+
+    def __contains__(self, key):
+        return key in self._recordings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._recordings))
+
+    def get(self, key: str) -> Optional[Recording]:
+        """
+        Get a recorded response
+
+        Args:
+            key: The key of the URL, see `cassette_key`
+
+        Returns:
+            tuple: The status, headers and body of the response, or None if
+            the URL wasn't recorded
+        """
+        return self._recordings.get(key)
+
+    def record(self, key: str, status: int, headers: Dict[str, str], body: str):
+        """
+        Record a response
+
+        Args:
+            key: The key of the URL, see `cassette_key`
+            status: The status code of the response
+            headers: The headers of the response
+            body: The decoded body of the response
+        """
+        headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in _TRANSFER_HEADERS
+        }
+        entry = {"url": key, "status": status, "headers": headers, "body": body}
+        with self._lock:
+            self._recordings[key] = (status, headers, body)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter serving the pages recorded in a cassette
+
+    Replayed pages are served immediately, without waiting for any rate
+    limiter. Pages missing from the cassette are either fetched with
+    `adapter` and recorded, or rejected with `CassetteMiss`.
+
+    Args:
+        cassette: The cassette
+        record: Whether missing pages are fetched and recorded
+        adapter: The adapter fetching missing pages (e.g. a ThrottledAdapter)
+    """
+
+    def __init__(
+        self, cassette: Cassette, record: bool = False, adapter: BaseAdapter = None
+    ):
+        super().__init__()
+        self.cassette = cassette
+        self.record = record
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        key = cassette_key(request.url)
+        recording = self.cassette.get(key)
+        if recording is not None:
+            return self._replay(request, *recording)
+        if not self.record or self.adapter is None:
+            raise CassetteMiss(f"{key} is not in {self.cassette.path}", request=request)
+
+        response = self.adapter.send(request, **kwargs)
+        self.cassette.record(
+            key, response.status_code, dict(response.headers), response.text
+        )
+        return response
+
+    def _replay(self, request, status: int, headers: Dict[str, str], body: str):
+        raw = HTTPResponse(
+            body=io.BytesIO(body.encode("utf-8")),
+            headers=utf8_headers(headers),
+            status=status,
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+    def close(self):
+        super().close()
+        if self.adapter is not None:
+            self.adapter.close()
+
+
+def utf8_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """
+    Get the headers of a recorded response, whose body is served as UTF-8
+
+    Args:
+        headers: The recorded headers
+
+    Returns:
+        dict: The headers, with the charset of the Content-Type set to UTF-8
+    """
+    content_type = "text/html"
+    served = {}
+    for name, value in headers.items():
+        if name.lower() == "content-type":
+            content_type = value.split(";")[0]
+        else:
+            served[name] = value
+    served["Content-Type"] = f"{content_type}; charset=utf-8"
+    return served
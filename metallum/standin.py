@@ -0,0 +1,175 @@
+"""Local stand-in for the site, serving the pages recorded in a cassette
+
+The server can add latency to every response and throttle clients with
+`429 Too Many Requests`, which makes it possible to load-test code using
+metallum deterministically, without sending a single request to the site:
+
+    python -m metallum.standin site.jsonl --port 8000 --latency 0.2 --rate 1
+
+    client = metallum.Client(base_url="http://127.0.0.1:8000")
+"""
+
+import argparse
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from metallum.ratelimit import TokenBucket
+from metallum.replay import Cassette, utf8_headers
+
+
+class StandInServer:
+    """
+    HTTP server serving the pages of a cassette
+
+    Pages missing from the cassette are answered with 404 Not Found.
+
+    Args:
+        cassette: The cassette, or the path of its file
+        host: The address to listen on
+        port: The port to listen on, any free port by default
+        latency: Time spent before answering each request, in seconds
+        rate: Number of requests per second served before answering
+            `429 Too Many Requests` (unlimited by default)
+        burst: Number of requests that may be sent back to back within `rate`
+    """
+
+    def __init__(
+        self,
+        cassette,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate: Optional[float] = None,
+        burst: int = 1,
+    ):
+        if isinstance(cassette, str):
+            cassette = Cassette(cassette)
+        self.cassette = cassette
+        self.latency = latency
+        self.requests = 0
+        self.throttled = 0
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self):
+        return f"<StandInServer: {self.url}>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server, to be given to `Client(base_url=...)`"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        """
+        Serve requests in a background thread
+
+        Returns:
+            StandInServer: The server itself
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metallum-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving requests"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        """Serve requests in the current thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def _retry_after(self) -> Optional[float]:
+        """Count a request, and get how long it must wait if it is throttled"""
+        with self._lock:
+            self.requests += 1
+            if self._bucket is None:
+                return None
+            delay = self._bucket.try_take()
+            if delay <= 0:
+                return None
+            self.throttled += 1
+            return delay
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answer requests from the cassette"""
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                if server.latency:
+                    time.sleep(server.latency)
+
+                retry_after = server._retry_after()
+                if retry_after is not None:
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(math.ceil(retry_after)))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                recording = server.cassette.get(self.path)
+                if recording is None:
+                    status, headers, body = 404, {}, ""
+                else:
+                    status, headers, body = recording
+                content = body.encode("utf-8")
+                self.send_response(status)
+                for name, value in utf8_headers(headers).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+
+def main(argv=None) -> None:
+    """Run a stand-in server from the command line"""
+    parser = argparse.ArgumentParser(
+        prog="python -m metallum.standin", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("cassette", help="the cassette file to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="in seconds")
+    parser.add_argument("--rate", type=float, help="requests per second")
+    parser.add_argument("--burst", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        args.cassette, args.host, args.port, args.latency, args.rate, args.burst
+    )
+    print(f"Serving {len(server.cassette)} pages on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
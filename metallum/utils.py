@@ -1,13 +1,14 @@
 """Utility functions for the Metallum package."""
 
 import datetime
+import itertools
 import re
-from functools import lru_cache
-from typing import List
+import threading
+from typing import Callable, List, Sequence, Union
 
-from fake_useragent import UserAgent
+from metallum.consts import BASE_URL, USER_AGENT, UTC_OFFSET
 
-from metallum.consts import BASE_URL, UTC_OFFSET
+UserAgent = Union[str, Sequence[str], Callable[[], str]]
 
 
 def map_params(params, m):
@@ -58,17 +59,18 @@ def split_genres(s: str) -> List[str]:
     return re.split(r"(?:,|;)\s*(?![^()]*\))", s)
 
 
-def make_absolute(endpoint: str) -> str:
+def make_absolute(endpoint: str, base_url: str = BASE_URL) -> str:
     """
     Make relative URLs absolute
 
     Args:
         endpoint: The relative URL.
+        base_url: The root of the site.
 
     Returns:
         str: The absolute URL.
     """
-    return f"{BASE_URL}/{endpoint}"
+    return f"{base_url}/{endpoint}"
 
 
 def offset_time(t: datetime.datetime) -> datetime.datetime:
@@ -112,9 +114,61 @@ def parse_duration(s: str) -> int:
     return seconds
 
 
-@lru_cache
-def get_user_agent():
-    """Get a random user agent."""
-    ua = UserAgent().getSafari["useragent"]
-    print(ua)
-    return ua
+class memoized_property(property):  # pylint: disable=invalid-name
+    """
+    Property computed on first access and then served from the instance's
+    `_memo` dict, until the instance is refreshed.
+
+    Values can be seeded before first access by storing them in `_memo`.
+    """
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        memo = obj.__dict__.setdefault("_memo", {})
+        name = self.fget.__name__
+        try:
+            return memo[name]
+        except KeyError:
+            value = memo[name] = self.fget(obj)
+            return value
+
+
+def user_agent_provider(user_agent: UserAgent = USER_AGENT) -> Callable[[], str]:
+    """
+    Get a function returning the User-Agent of each request
+
+    Args:
+        user_agent: Either a fixed User-Agent, a list of User-Agents used in
+            turn, or a function returning the User-Agent of each request
+
+    Returns:
+        Callable[[], str]: The User-Agent provider
+
+    Examples:
+        >>> user_agent_provider('metallum')()
+        'metallum'
+        >>> provider = user_agent_provider(['a', 'b'])
+        >>> [provider() for _ in range(3)]
+        ['a', 'b', 'a']
+    """
+    if callable(user_agent):
+        return user_agent
+    if isinstance(user_agent, str):
+        return lambda: user_agent
+    if not user_agent:
+        raise ValueError("user_agent must not be empty")
+
+    pool = itertools.cycle(list(user_agent))
+    lock = threading.Lock()
+
+    def rotate() -> str:
+        with lock:
+            return next(pool)
+
+    return rotate
+
+
+def get_user_agent() -> str:
+    """Get the default User-Agent."""
+    return USER_AGENT
@@ -0,0 +1,107 @@
+import io
+import os
+import time
+
+import pytest
+from urllib3.response import HTTPResponse
+
+from metallum.client import Client
+from metallum.consts import BASE_URL
+from metallum.operations import album_search_url, band_search_url, song_search_url
+from metallum.ratelimit import RateLimiter, ThrottledAdapter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def band_page(band_id, name):
+    """Minimal band page for bands which only matter by name"""
+    return (
+        f'<h1 class="band_name"><a href="{BASE_URL}/bands/_/{band_id}">'
+        f"{name}</a></h1>"
+    )
+
+
+def site_pages():
+    """Hand-written pages modelled on those of the site, keyed by URL"""
+    return {
+        "bands/_/125": load_fixture("band_125.html"),
+        "bands/_/3524": band_page(3524, "Lunar Aurora"),
+        "bands/_/3815": band_page(3815, "Paysage d'Hiver"),
+        "bands/_/25": band_page(25, "Iron Maiden"),
+        "bands/_/9": band_page(9, "Amorphis"),
+        "bands/_/1093": band_page(1093, "Blut aus Nord"),
+        "band/discography/id/125/tab/all": load_fixture("discography_125.html"),
+        "band/ajax-recommendations/id/125/showMoreSimilar/1": load_fixture(
+            "similar_125.html"
+        ),
+        "albums/_/_/547": load_fixture("album_547.html"),
+        "albums/_/_/42682": load_fixture("album_42682.html"),
+        "albums/_/_/338756": load_fixture("album_338756.html"),
+        "release/ajax-view-lyrics/id/5018A": load_fixture("lyrics_5018A.html"),
+        "release/ajax-view-lyrics/id/3449": "<p>Fear of the dark, fear of the dark</p>",
+        band_search_url("metallica"): load_fixture("search_bands_metallica.json"),
+        album_search_url("tuonela"): load_fixture("search_albums_tuonela.json"),
+        song_search_url(
+            "Fear of the Dark", band="Iron Maiden", release="Fear of the Dark"
+        ): load_fixture("search_songs_fear.json"),
+    }
+
+
+class StubAdapter(ThrottledAdapter):
+    """Transport adapter serving canned pages instead of hitting the site"""
+
+    def __init__(self, pages=None, rate_limiter=None, **kwargs):
+        super().__init__(rate_limiter or RateLimiter(rate=1000, burst=1000), **kwargs)
+        self.pages = pages or {}
+        self.requests = []
+        self.delay = 0
+
+    def _send(self, request, **kwargs):
+        self.requests.append(request)
+        time.sleep(self.delay)
+        url = request.url[len(BASE_URL) + 1 :]
+        page = self.pages.get(url)
+        if isinstance(page, list):
+            page = page.pop(0) if len(page) > 1 else page[0]
+        if page is None:
+            status, body, headers = 404, "", {}
+        elif isinstance(page, tuple):
+            status, body, headers = page
+        else:
+            status, body, headers = 200, page, {}
+        raw = HTTPResponse(
+            body=io.BytesIO(body.encode()),
+            headers={"Content-Type": "text/html; charset=utf-8", **headers},
+            status=status,
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+@pytest.fixture
+def rate_limiter():
+    return RateLimiter(rate=1000, burst=1000)
+
+
+@pytest.fixture
+def stub(rate_limiter):
+    return StubAdapter(rate_limiter=rate_limiter)
+
+
+@pytest.fixture
+def site(stub):
+    stub.pages.update(site_pages())
+    return stub
+
+
+@pytest.fixture
+def client(stub, rate_limiter):
+    c = Client(backend="memory", rate_limiter=rate_limiter)
+    c.mount(BASE_URL, stub)
+    yield c
+    c.close()
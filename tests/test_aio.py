@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+
+from metallum import aio
+from metallum.client import Client
+from metallum.consts import BASE_URL
+from metallum.ratelimit import RateLimiter
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_band_for_id(client, site):
+    band = run(aio.band_for_id("125", aio.AsyncClient(client)))
+    assert band.name == "Metallica"
+    assert band._client is client
+
+
+def test_album_for_id_and_tracks(client, site):
+    async def main():
+        async_client = aio.AsyncClient(client)
+        album = await aio.album_for_id("547", async_client)
+        tracks = await aio.tracks(album, async_client)
+        lyrics = await aio.lyrics(tracks[0], async_client)
+        return album, tracks, lyrics
+
+    album, tracks, lyrics = run(main())
+    # The tracklist is the album's, parsed from the album page fetched once
+    assert tracks is album.tracks
+    assert [request.url for request in site.requests].count(
+        f"{BASE_URL}/albums/_/_/547"
+    ) == 1
+    assert album.title == "Master of Puppets"
+    assert [track.title for track in tracks][:2] == ["Battery", "Master of Puppets"]
+    assert str(lyrics).startswith("Lashing out the action")
+
+
+def test_searches_run_concurrently(client, site):
+    async def main():
+        async_client = aio.AsyncClient(client)
+        return await asyncio.gather(
+            aio.band_search("metallica", client=async_client, keep_html=True),
+            aio.album_search("tuonela", client=async_client),
+            aio.song_search(
+                "Fear of the Dark",
+                client=async_client,
+                band="Iron Maiden",
+                release="Fear of the Dark",
+            ),
+        )
+
+    bands, albums, songs = run(main())
+    assert bands[0].name == "Metallica"
+    assert bands[0].html[0].startswith("<a href=")
+    assert albums[0].title == "Tuonela"
+    assert albums[0].html is None
+    assert songs[0].title == "Fear of the Dark"
+
+
+def test_band_properties(client, site):
+    async def main():
+        async_client = aio.AsyncClient(client)
+        band = await aio.band_for_id("125", async_client)
+        return await asyncio.gather(
+            aio.albums(band, async_client), aio.similar_artists(band, async_client)
+        )
+
+    albums, similar = run(main())
+    assert albums[3].title == "Master of Puppets"
+    assert similar[0].name == "Megadeth"
+
+
+def test_cached_pages_skip_rate_limiter(site):
+    client = Client(backend="memory", rate_limiter=RateLimiter(rate=1, burst=1))
+    client.mount(BASE_URL, site)
+    async_client = aio.AsyncClient(client)
+    run(aio.band_for_id("125", async_client))
+
+    start = time.monotonic()
+    for _ in range(3):
+        run(aio.band_for_id("125", async_client))
+    # Waiting for the limiter would take a second per page
+    assert time.monotonic() - start < 0.5
+    assert len(site.requests) == 1
+
+
+def test_cached_pages_are_read_once_off_the_loop(client, site, monkeypatch):
+    async_client = aio.AsyncClient(client)
+    run(aio.band_for_id("125", async_client))
+    reads = []
+    get_response = client.cache.get_response
+
+    def read(*args, **kwargs):
+        reads.append(threading.current_thread())
+        return get_response(*args, **kwargs)
+
+    monkeypatch.setattr(client.cache, "get_response", read)
+    band = run(aio.band_for_id("125", async_client))
+    assert band.name == "Metallica"
+    assert len(reads) == 1
+    assert reads[0] is not threading.main_thread()
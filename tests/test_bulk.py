@@ -0,0 +1,67 @@
+import requests
+
+from metallum.bulk import fetch_many
+from metallum.operations import albums_for_ids, bands_for_ids, lyrics_for_ids
+
+
+def test_bands_for_ids(client, site):
+    progress = []
+    results = list(
+        bands_for_ids(
+            ["125", "3524", "125", "3815"],
+            workers=2,
+            progress=lambda done, total: progress.append((done, total)),
+            client=client,
+        )
+    )
+    assert [result.id for result in results] == ["125", "3524", "3815"]
+    assert [result.value.name for result in results] == [
+        "Metallica",
+        "Lunar Aurora",
+        "Paysage d'Hiver",
+    ]
+    assert all(result.ok for result in results)
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert len(site.requests) == 3
+
+
+def test_albums_and_lyrics_for_ids(client, site):
+    albums = list(albums_for_ids(["547", "42682"], client=client))
+    assert [album.value.title for album in albums] == [
+        "Master of Puppets",
+        "Paysage d'Hiver / Lunar Aurora",
+    ]
+    lyrics = list(lyrics_for_ids(["5018A"], client=client))
+    assert str(lyrics[0].value).startswith("Lashing out the action")
+
+
+def test_error_pages_are_failures(client, site):
+    site.pages["bands/_/404"] = (404, "", {})
+    site.pages["bands/_/503"] = (503, "", {"Retry-After": "0"})
+    results = {
+        result.id: result
+        for result in bands_for_ids(["125", "404", "503"], client=client)
+    }
+    assert results["125"].ok
+    for band_id in ("404", "503"):
+        assert not results[band_id].ok
+        assert results[band_id].value is None
+        assert isinstance(results[band_id].error, requests.HTTPError)
+
+
+def test_errors_are_captured_per_item():
+    class Page:
+        def __init__(self, item_id):
+            if item_id == 2:
+                raise ValueError("broken")
+            self.item_id = item_id
+
+        def load(self):
+            return self
+
+    results = list(fetch_many(Page, range(5), workers=3, ordered=False))
+    assert sorted(result.id for result in results) == [0, 1, 2, 3, 4]
+    failed = [result for result in results if not result.ok]
+    assert len(failed) == 1
+    assert failed[0].id == 2
+    assert isinstance(failed[0].error, ValueError)
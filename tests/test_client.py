@@ -0,0 +1,250 @@
+import datetime
+import subprocess
+import sys
+import time
+
+import pytest
+
+from metallum.client import Client, configure, get_client, set_client, vacuum_cache
+from metallum.consts import BASE_URL, USER_AGENT
+from metallum.models.lyrics import Lyrics
+from metallum.operations import lyrics_for_id
+
+
+def test_default_client_is_shared():
+    set_client(None)
+    assert get_client() is get_client()
+
+
+def test_set_client(client):
+    set_client(client)
+    try:
+        assert get_client() is client
+        assert Lyrics(1)._client is client
+    finally:
+        set_client(None)
+
+
+def test_pages_share_injected_client(client, stub):
+    stub.pages["release/ajax-view-lyrics/id/1"] = "<p>Some lyrics</p>"
+    stub.pages["release/ajax-view-lyrics/id/2"] = "<p>Other lyrics</p>"
+
+    first = lyrics_for_id(1, client=client)
+    second = lyrics_for_id(2, client=client)
+
+    assert first._client is second._client is client
+    assert str(first) == "Some lyrics"
+    assert str(second) == "Other lyrics"
+    assert len(stub.requests) == 2
+
+
+def test_client_caches_responses(client, stub):
+    stub.pages["release/ajax-view-lyrics/id/1"] = "<p>Some lyrics</p>"
+
+    lyrics_for_id(1, client=client).load()
+    lyrics_for_id(1, client=client).load()
+
+    assert len(stub.requests) == 1
+
+
+def test_invalidate(client, stub):
+    stub.pages["release/ajax-view-lyrics/id/1"] = "<p>Some lyrics</p>"
+
+    client.fetch("release/ajax-view-lyrics/id/1")
+    client.invalidate("release/ajax-view-lyrics/id/1")
+    client.fetch("release/ajax-view-lyrics/id/1")
+
+    assert len(stub.requests) == 2
+
+
+def test_client_headers():
+    client = Client(backend="memory", headers={"X-Test": "1"}, keep_alive=False)
+    assert client.session.headers["X-Test"] == "1"
+    assert client.session.headers["Connection"] == "close"
+
+
+def test_fixed_user_agent():
+    client = Client(backend="memory", user_agent="metallum-test")
+    assert client.session.headers["User-Agent"] == "metallum-test"
+    assert Client(backend="memory").session.headers["User-Agent"] == USER_AGENT
+
+
+def test_user_agent_pool(stub, rate_limiter):
+    client = Client(backend="memory", rate_limiter=rate_limiter, user_agent=["a", "b"])
+    client.mount(BASE_URL, stub)
+    for page in ("one", "two", "three"):
+        client.get(page)
+    assert [r.headers["User-Agent"] for r in stub.requests] == ["a", "b", "a"]
+
+
+def test_user_agent_callback(stub, rate_limiter):
+    client = Client(
+        backend="memory", rate_limiter=rate_limiter, user_agent=lambda: "callback"
+    )
+    client.mount(BASE_URL, stub)
+    client.get("one")
+    assert stub.requests[0].headers["User-Agent"] == "callback"
+
+
+def test_urls_expire_after(client, stub):
+    stub.pages["release/ajax-view-lyrics/id/1"] = "<p>Some lyrics</p>"
+    stub.pages["search/ajax-advanced/searching/bands/?bandName=x"] = "{}"
+    lyrics = client.get("release/ajax-view-lyrics/id/1")
+    search = client.get("search/ajax-advanced/searching/bands/?bandName=x")
+    assert lyrics.expires is None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ttl = search.expires.replace(tzinfo=datetime.timezone.utc) - now
+    assert datetime.timedelta(minutes=9) < ttl <= datetime.timedelta(minutes=10)
+
+
+def test_custom_urls_expire_after(stub, rate_limiter):
+    client = Client(
+        backend="memory",
+        rate_limiter=rate_limiter,
+        expire_after=-1,
+        urls_expire_after={"*/bands/": 0},
+    )
+    client.mount(BASE_URL, stub)
+    stub.pages["bands/_/1"] = "band"
+    stub.pages["albums/_/_/1"] = "album"
+    for _ in range(2):
+        client.get("bands/_/1")
+        client.get("albums/_/_/1")
+    assert [r.path_url for r in stub.requests] == [
+        "/bands/_/1",
+        "/albums/_/_/1",
+        "/bands/_/1",
+    ]
+
+
+def test_filesystem_backend(stub, rate_limiter, tmp_path):
+    client = Client(
+        cache_name=str(tmp_path / "cache"),
+        backend="filesystem",
+        rate_limiter=rate_limiter,
+    )
+    client.mount(BASE_URL, stub)
+    stub.pages["bands/_/1"] = "band"
+    assert client.fetch("bands/_/1") == client.fetch("bands/_/1") == "band"
+    assert len(stub.requests) == 1
+    assert list((tmp_path / "cache").iterdir())
+
+
+def test_redis_backend(stub, rate_limiter):
+    fakeredis = pytest.importorskip("fakeredis")
+    client = Client(
+        cache_name="metallum-test",
+        backend="redis",
+        rate_limiter=rate_limiter,
+        connection=fakeredis.FakeRedis(),
+    )
+    client.mount(BASE_URL, stub)
+    stub.pages["bands/_/1"] = "band"
+    assert client.fetch("bands/_/1") == client.fetch("bands/_/1") == "band"
+    assert len(stub.requests) == 1
+
+
+def test_import_has_no_side_effects():
+    code = (
+        "import requests, metallum, metallum.client; "
+        "assert requests.Session.__module__.startswith('requests.'); "
+        "assert metallum.client._default_client is None"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_configure():
+    client = configure(backend="memory", timeout=5)
+    try:
+        assert get_client() is client
+        assert client.timeout == 5
+    finally:
+        set_client(None)
+
+
+def test_configure_closes_previous_client(monkeypatch):
+    previous = configure(backend="memory")
+    closed = []
+    monkeypatch.setattr(previous, "close", lambda: closed.append(previous))
+    try:
+        client = configure(backend="memory")
+        assert get_client() is client
+        assert closed == [previous]
+    finally:
+        set_client(None)
+
+
+def test_vacuum_cache(client, stub):
+    stub.pages["release/ajax-view-lyrics/id/1"] = "<p>Some lyrics</p>"
+    client.session.settings.expire_after = 1
+    client.get("release/ajax-view-lyrics/id/1")
+    assert len(list(client.cache.responses.keys())) == 1
+
+    key = next(iter(client.cache.responses.keys()))
+    response = client.cache.responses[key]
+    response.expires = datetime.datetime(2000, 1, 1)
+    client.cache.responses[key] = response
+    vacuum_cache(client, background=True).join()
+    assert not list(client.cache.responses.keys())
+
+
+def test_scheduled_vacuum(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(client, "vacuum", lambda: calls.append(1))
+    thread = vacuum_cache(client, interval=0.01)
+    time.sleep(0.1)
+    thread.stop()
+    thread.join()
+    assert calls
+
+
+def expire(client):
+    for key in list(client.cache.responses.keys()):
+        response = client.cache.responses[key]
+        response.expires = datetime.datetime(2000, 1, 1)
+        client.cache.responses[key] = response
+
+
+def test_expired_response_is_revalidated(client, stub):
+    stub.pages["bands/_/1"] = [
+        (200, "band", {"ETag": '"v1"'}),
+        (304, "", {"ETag": '"v1"'}),
+    ]
+    assert client.fetch("bands/_/1") == "band"
+    expire(client)
+
+    assert client.fetch("bands/_/1") == "band"
+    assert stub.requests[1].headers["If-None-Match"] == '"v1"'
+    # The revalidated response is fresh again
+    assert client.fetch("bands/_/1") == "band"
+    assert len(stub.requests) == 2
+
+
+def test_stale_while_revalidate(stub, rate_limiter):
+    client = Client(
+        backend="memory", rate_limiter=rate_limiter, stale_while_revalidate=True
+    )
+    client.mount(BASE_URL, stub)
+    stub.pages["bands/_/1"] = ["old", "new"]
+    assert client.fetch("bands/_/1") == "old"
+    expire(client)
+
+    assert client.fetch("bands/_/1") == "old"
+    for _ in range(100):
+        if client.fetch("bands/_/1") == "new":
+            break
+        time.sleep(0.01)
+    assert client.fetch("bands/_/1") == "new"
+
+
+def test_vacuum_keeps_revalidatable_responses(client, stub):
+    last_modified = "Mon, 01 Jan 2024 00:00:00 GMT"
+    stub.pages["bands/_/1"] = (200, "band", {"Last-Modified": last_modified})
+    stub.pages["bands/_/2"] = "band"
+    client.fetch("bands/_/1")
+    client.fetch("bands/_/2")
+    expire(client)
+
+    client.vacuum()
+    urls = [response.url for response in client.cache.responses.values()]
+    assert urls == [BASE_URL + "/bands/_/1"]
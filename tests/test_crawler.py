@@ -0,0 +1,154 @@
+import datetime
+import json
+
+import pytest
+
+from metallum.consts import BASE_URL, UTC_OFFSET
+from metallum.crawler import Crawler, _months, _utcnow
+from metallum.operations import modified_bands_url
+
+
+@pytest.fixture
+def state(tmp_path):
+    return str(tmp_path / "crawl.sqlite")
+
+
+def crawl(state, client, limit=None):
+    with Crawler(state, client=client) as crawler:
+        return [(record.kind, record.id) for record in crawler.crawl(limit)]
+
+
+def test_crawl(client, site, state):
+    with Crawler(state, client=client) as crawler:
+        crawler.add_bands(["125", "125"])
+        records = list(crawler.crawl())
+        stats = crawler.stats()
+        failures = crawler.failures()
+
+    band = records[0]
+    assert (band.kind, band.id, band.data["name"]) == ("band", "125", "Metallica")
+    kinds = [record.kind for record in records]
+    # Breadth-first: the band, then its albums, then their lyrics
+    assert kinds == sorted(kinds, key=["band", "album", "lyrics"].index)
+    crawled = [(record.kind, record.id) for record in records]
+    assert ("album", "547") in crawled
+    assert ("lyrics", "5018A") in crawled
+    # The last track of album 547 has no lyrics
+    assert ("lyrics", "5020A") not in crawled + list(failures)
+    assert stats["band"] == {"done": 1}
+    # Albums missing from the recorded site fail
+    assert stats["album"] == {"done": 1, "failed": 4}
+
+
+def test_resume(client, site, state):
+    with Crawler(state, client=client) as crawler:
+        crawler.add_bands(["125"])
+    first = crawl(state, client, limit=2)
+    rest = crawl(state, client)
+    assert first[0] == ("band", "125")
+    assert not set(first) & set(rest)
+
+    with Crawler(state, client=client) as crawler:
+        crawler.add_bands(["125"])
+        assert not list(crawler.crawl())
+
+
+def test_failures_are_retried(client, site, state):
+    with Crawler(state, client=client, albums=False) as crawler:
+        crawler.add("lyrics", ["5018A"])
+        crawler.add("unknown", ["1"])
+        assert [r.id for r in crawler.crawl()] == ["5018A"]
+        assert list(crawler.failures()) == [("unknown", "1")]
+        assert crawler.retry_failed() == 1
+        assert crawler.stats()["unknown"] == {"pending": 1}
+
+
+@pytest.mark.parametrize("status", [404, 429, 503])
+def test_error_pages_fail(client, site, state, status):
+    # Throttled pages are retried right away, then given up
+    site.pages["bands/_/1"] = (status, "", {"Retry-After": "0"})
+    with Crawler(state, client=client, albums=False) as crawler:
+        crawler.add_bands(["1"])
+        assert not list(crawler.crawl())
+        failures = crawler.failures()
+        assert list(failures) == [("band", "1")]
+        assert str(status) in failures[("band", "1")]
+
+        site.pages["bands/_/1"] = site.pages["bands/_/125"]
+        assert crawler.retry_failed() == 1
+        assert [record.data["name"] for record in crawler.crawl()] == ["Metallica"]
+
+
+def listing(*changes):
+    """Page of the list of recently modified bands"""
+    rows = [
+        [
+            modified.strftime("%B %d"),
+            f'<a href="{BASE_URL}/bands/_/{band_id}">Band {band_id}</a>',
+            f'<a href="{BASE_URL}/lists/US">United States</a>',
+            "Thrash Metal",
+            modified.strftime("%Y-%m-%d %H:%M:%S"),
+            f'<a href="{BASE_URL}/users/Ziltoid">Ziltoid</a>',
+        ]
+        for band_id, modified in changes
+    ]
+    return json.dumps(
+        {"iTotalRecords": len(rows), "iTotalDisplayRecords": len(rows), "aaData": rows}
+    )
+
+
+def test_sync(client, site, state):
+    with Crawler(state, client=client) as crawler:
+        crawler.add_bands(["125"])
+        list(crawler.crawl())
+
+    since = _utcnow() - datetime.timedelta(hours=1)
+    # The lists are in server time
+    server_time = _utcnow() - datetime.timedelta(hours=UTC_OFFSET, minutes=10)
+    for month in _months(since, _utcnow()):
+        site.pages[modified_bands_url(month)] = listing(
+            ("125", server_time), ("9999", server_time)
+        )
+
+    with Crawler(state, client=client) as crawler:
+        # Older changes were already crawled
+        assert crawler.update("band", [("125", datetime.datetime(2024, 1, 1))]) == 0
+        assert crawler.sync(since) == 1
+        site.requests.clear()
+        records = [(record.kind, record.id) for record in crawler.crawl()]
+        fetched = {request.url[len(BASE_URL) + 1 :] for request in site.requests}
+        # Nothing changed since the last sync
+        assert crawler.sync() == 0
+
+    # Unknown bands and the albums of the band aren't crawled again
+    assert records == [("band", "125")]
+    # The band and its discography are downloaded again despite the cache
+    assert {"bands/_/125", "band/discography/id/125/tab/all"} <= fetched
+
+
+def test_consecutive_syncs(client, site, state):
+    with Crawler(state, client=client) as crawler:
+        crawler.add_bands(["125"])
+        list(crawler.crawl())
+
+    def modify(band_id, delay):
+        # The lists are in server time
+        server_time = _utcnow() - datetime.timedelta(hours=UTC_OFFSET)
+        change = (band_id, server_time + delay)
+        for month in _months(_utcnow() - datetime.timedelta(days=1), _utcnow()):
+            site.pages[modified_bands_url(month)] = listing(change)
+
+    with Crawler(state, client=client) as crawler:
+        modify("125", -datetime.timedelta(minutes=10))
+        assert crawler.sync(_utcnow() - datetime.timedelta(hours=1)) == 1
+        list(crawler.crawl())
+        # The band is modified again on the site between two syncs
+        modify("125", datetime.timedelta(seconds=1))
+        assert crawler.sync() == 1
+        assert [record.id for record in crawler.crawl()] == ["125"]
+
+
+def test_sync_requires_a_crawl(client, site, state):
+    with Crawler(state, client=client) as crawler:
+        with pytest.raises(ValueError):
+            crawler.sync()
@@ -0,0 +1,189 @@
+import io
+import itertools
+import json
+import sqlite3
+
+import pytest
+
+from metallum.consts import BASE_URL
+from metallum.crawler import Crawler, CrawlRecord
+from metallum.export import (
+    JsonLinesExporter,
+    SQLiteExporter,
+    export_jsonl,
+    export_parquet,
+    export_sqlite,
+)
+from metallum.models import AlbumWrapper, Band
+from metallum.models.lyrics import Lyrics
+from metallum.models.results import ModifiedBandResult
+from metallum.operations import album_search, band_search, song_search
+
+
+@pytest.fixture
+def records(client, site, tmp_path):
+    states = itertools.count()
+
+    def crawl():
+        state = str(tmp_path / f"crawl{next(states)}.sqlite")
+        with Crawler(state, client=client) as crawler:
+            crawler.add_bands(["125"])
+            yield from crawler.crawl()
+
+    return crawl
+
+
+def test_jsonl(records, tmp_path):
+    path = tmp_path / "export.jsonl"
+    count = export_jsonl(records(), path)
+
+    with open(path, encoding="utf-8") as f:
+        documents = [json.loads(line) for line in f]
+    assert len(documents) == count == 3
+    band, album, lyrics = documents
+    assert (band["kind"], band["name"]) == ("band", "Metallica")
+    assert band["added"].startswith("20")
+    assert album["kind"] == "album"
+    assert album["tracks"][0]["band"]["name"] == "Metallica"
+    assert (lyrics["kind"], lyrics["id"]) == ("lyrics", "5018A")
+
+
+def test_jsonl_entities(client, site):
+    output = io.StringIO()
+    with JsonLinesExporter(output) as exporter:
+        exporter.write(Band.for_id("125", client=client))
+        album = AlbumWrapper.for_id("547", client=client)
+        exporter.write(album)
+        exporter.write(album.tracks[0])
+        exporter.write(Lyrics("5018A", client=client))
+        with pytest.raises(TypeError):
+            exporter.write("125")
+
+    kinds = [json.loads(line)["kind"] for line in output.getvalue().splitlines()]
+    assert kinds == ["band", "album", "track", "lyrics"]
+
+
+def test_sqlite(records, tmp_path):
+    path = str(tmp_path / "export.sqlite")
+    assert export_sqlite(records(), path, batch_size=2) == 3
+    # Exporting again replaces the rows
+    assert export_sqlite(records(), path) == 3
+
+    db = sqlite3.connect(path)
+    counts = {
+        table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("bands", "albums", "album_bands", "tracks", "lyrics")
+    }
+    genres = db.execute("SELECT genres FROM bands").fetchone()[0]
+    joined = db.execute(
+        "SELECT b.name, a.title, t.title, l.lyrics FROM bands b "
+        "JOIN album_bands ab ON ab.band_id = b.id "
+        "JOIN albums a ON a.id = ab.album_id "
+        "JOIN tracks t ON t.album_id = a.id "
+        "JOIN lyrics l ON l.id = t.id"
+    ).fetchall()
+    db.close()
+
+    assert counts == {
+        "bands": 1,
+        "albums": 1,
+        "album_bands": 1,
+        "tracks": 3,
+        "lyrics": 1,
+    }
+    assert "Thrash Metal" in " ".join(json.loads(genres))
+    assert len(joined) == 1
+    assert joined[0][:2] == ("Metallica", "Master of Puppets")
+
+
+def test_sqlite_batches(client, site, tmp_path):
+    path = str(tmp_path / "export.sqlite")
+    with SQLiteExporter(path, batch_size=2) as exporter:
+        exporter.write(AlbumWrapper.for_id("547", client=client))
+        db = sqlite3.connect(path)
+        # Full batches are written as soon as they are complete
+        assert db.execute("SELECT COUNT(*) FROM tracks").fetchone()[0] == 2
+        assert db.execute("SELECT COUNT(*) FROM albums").fetchone()[0] == 0
+    assert db.execute("SELECT COUNT(*) FROM albums").fetchone()[0] == 1
+    db.close()
+
+
+def test_parquet(records, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    directory = tmp_path / "export"
+    assert export_parquet(records(), directory, batch_size=2) == 3
+
+    tracks = parquet.ParquetFile(directory / "tracks.parquet")
+    assert tracks.metadata.num_rows == 3
+    assert tracks.metadata.num_row_groups == 2
+    bands = parquet.read_table(directory / "bands.parquet").to_pylist()
+    assert bands[0]["name"] == "Metallica"
+    assert isinstance(bands[0]["genres"], list)
+
+
+def test_sqlite_replaces_album_parts(client, site, tmp_path):
+    path = str(tmp_path / "export.sqlite")
+    album = AlbumWrapper.for_id("547", client=client).to_dict()
+    changed = dict(
+        album,
+        bands=[{"id": "9", "name": "Amorphis"}],
+        tracks=album["tracks"][:2],
+    )
+    export_sqlite([CrawlRecord("album", "547", album)], path)
+    # Written again in a later export, and twice within the same batch
+    records = [CrawlRecord("album", "547", album), CrawlRecord("album", "547", changed)]
+    export_sqlite(records, path, batch_size=10)
+
+    db = sqlite3.connect(path)
+    bands = db.execute("SELECT band_id FROM album_bands").fetchall()
+    tracks = db.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+    db.close()
+    assert bands == [("9",)]
+    assert tracks == 2
+
+
+def test_search_results(client, site, tmp_path):
+    modified = ModifiedBandResult(
+        [
+            "October 18",
+            f'<a href="{BASE_URL}/bands/_/125">Metallica</a>',
+            "United States",
+            "Thrash Metal",
+            "2026-10-18 10:00:00",
+        ]
+    )
+    results = [
+        band_search("metallica", client=client)[0],
+        album_search("tuonela", client=client)[0],
+        song_search(
+            "Fear of the Dark",
+            band="Iron Maiden",
+            release="Fear of the Dark",
+            client=client,
+        )[0],
+        modified,
+    ]
+    output = io.StringIO()
+    export_jsonl(results, output)
+    documents = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [document["kind"] for document in documents] == [
+        "band_result",
+        "album_result",
+        "song_result",
+        "band_result",
+    ]
+    assert documents[2]["album"] == {"id": "3449", "title": "Fear of the Dark"}
+
+    path = str(tmp_path / "export.sqlite")
+    export_sqlite(results, path)
+    db = sqlite3.connect(path)
+    bands = db.execute("SELECT name, modified FROM band_results").fetchall()
+    albums = db.execute("SELECT title, band_names FROM album_results").fetchall()
+    songs = db.execute("SELECT title, album_id, band_ids FROM song_results").fetchall()
+    # Results don't replace the full entities
+    entities = db.execute("SELECT COUNT(*) FROM bands").fetchone()[0]
+    db.close()
+    assert bands == [("Metallica", modified.modified.isoformat())]
+    assert albums == [("Tuonela", '["Amorphis"]')]
+    assert songs == [("Fear of the Dark", "3449", '["25"]')]
+    assert entities == 0
@@ -0,0 +1,85 @@
+import ast
+import inspect
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("requests", "requests_cache", "pyquery", "lxml", "dateutil")
+
+# Cumulative import time of `import metallum`, in microseconds. Importing
+# any of the heavy modules alone exceeds it.
+IMPORT_BUDGET_US = 20_000
+
+
+def run(code):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import metallum",
+        "from metallum import utils",
+        "from metallum.operations import band_search_url",
+    ],
+)
+def test_import_is_lazy(statement):
+    run(
+        f"import sys; {statement}; "
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]; "
+        "assert not loaded, loaded"
+    )
+
+
+def import_time(module):
+    """Cumulative import time of a module reported by `-X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module and not name.startswith("  "):
+            return int(cumulative)
+    raise AssertionError(f"{module} not in the -X importtime output")
+
+
+def test_import_time_budget():
+    # Best of a few runs, to leave out noise from the machine
+    elapsed = min(import_time("metallum") for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_US
+
+
+def test_public_names_are_resolved_on_access():
+    run(
+        "import sys, metallum; "
+        "assert 'metallum.operations' not in sys.modules; "
+        "from metallum.operations import band_search; "
+        "assert metallum.band_search is band_search; "
+        "assert 'band_search' in dir(metallum)"
+    )
+
+
+def test_unknown_attribute():
+    import metallum
+
+    with pytest.raises(AttributeError):
+        metallum.not_a_name  # pylint: disable=pointless-statement
+
+
+def test_type_checking_names_are_public():
+    import metallum
+
+    # Names seen by type checkers must also be resolved at runtime
+    tree = ast.parse(inspect.getsource(metallum))
+    block = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.If) and ast.unparse(node.test) == "TYPE_CHECKING"
+    )
+    names = {alias.asname or alias.name for node in block.body for alias in node.names}
+    assert names == set(metallum.__all__)
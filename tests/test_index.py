@@ -0,0 +1,145 @@
+import datetime
+
+import pytest
+
+from metallum.crawler import CrawlRecord
+from metallum.export import export_sqlite
+from metallum.index import Index
+from metallum.models import AlbumWrapper, Band
+from metallum.models.lyrics import Lyrics
+
+
+def band(band_id, name, country, genres, formed_in):
+    return CrawlRecord(
+        "band",
+        band_id,
+        {
+            "id": band_id,
+            "name": name,
+            "country": country,
+            "genres": genres,
+            "formed_in": formed_in,
+        },
+    )
+
+
+def album(album_id, title, album_type, year, band_id):
+    return CrawlRecord(
+        "album",
+        album_id,
+        {
+            "id": album_id,
+            "title": title,
+            "type": album_type,
+            "date": datetime.datetime(year, 1, 1),
+            "bands": [{"id": band_id, "name": ""}],
+        },
+    )
+
+
+RECORDS = [
+    band("1", "Iron Maiden", "United Kingdom", ["Heavy Metal", "NWOBHM"], "1975"),
+    band("2", "Motörhead", "United Kingdom", ["Heavy Metal", "Rock 'n' Roll"], "1975"),
+    band("3", "Death", "United States", ["Death Metal (early)"], "1984"),
+    band("4", "In Flames", "Sweden", ["Melodic Death Metal (early)"], "1990"),
+    album("10", "Fear of the Dark", "Full-length", 1992, "1"),
+    album("11", "Live After Death", "Live album", 1985, "1"),
+    album("12", "Symbolic", "Full-length", 1995, "3"),
+]
+
+
+@pytest.fixture
+def index():
+    with Index() as index:
+        index.write_all(RECORDS)
+        yield index
+
+
+def names(rows, key="name"):
+    return [row[key] for row in rows]
+
+
+def test_search_bands(index):
+    assert names(index.search_bands("iron maid")) == ["Iron Maiden"]
+    assert names(index.search_bands("maid", prefix=False)) == []
+    # Diacritics are ignored
+    assert names(index.search_bands("MOTORHEAD")) == ["Motörhead"]
+    assert names(index.search_bands("iorn maidn", fuzzy=True)) == ["Iron Maiden"]
+    assert names(index.search_bands("omtorhead", fuzzy=True)) == ["Motörhead"]
+    assert names(index.search_bands("   ")) == [
+        "Death",
+        "In Flames",
+        "Iron Maiden",
+        "Motörhead",
+    ]
+
+
+def test_band_filters(index):
+    assert names(index.search_bands(genre="death")) == ["Death", "In Flames"]
+    assert names(index.search_bands(country="united kingdom", year=1975)) == [
+        "Iron Maiden",
+        "Motörhead",
+    ]
+    assert index.search_bands("in", genre="death")[0]["genres"] == [
+        "Melodic Death Metal (early)"
+    ]
+    assert len(index.search_bands(limit=1)) == 1
+
+
+def test_search_albums(index):
+    assert names(index.search_albums("dark"), "title") == ["Fear of the Dark"]
+    assert names(index.search_albums(band_id="1"), "title") == [
+        "Live After Death",
+        "Fear of the Dark",
+    ]
+    assert names(index.search_albums(type="Full-length", year=1995), "title") == [
+        "Symbolic"
+    ]
+
+
+def test_facets(index):
+    assert index.band_facets("country") == {
+        "United Kingdom": 2,
+        "Sweden": 1,
+        "United States": 1,
+    }
+    assert index.band_facets("genre", genre="heavy") == {
+        "Heavy Metal": 2,
+        "NWOBHM": 1,
+        "Rock 'n' Roll": 1,
+    }
+    assert index.band_facets("year", name="death") == {"1984": 1}
+    assert index.album_facets("type") == {"Full-length": 2, "Live album": 1}
+    with pytest.raises(ValueError):
+        index.band_facets("label")
+
+
+def test_updates_replace_rows(index):
+    index.write(band("1", "Iron Maiden (UK)", "United Kingdom", [], "1975"))
+    assert names(index.search_bands("maiden")) == ["Iron Maiden (UK)"]
+    assert index.band_facets("country")["United Kingdom"] == 2
+
+
+def test_lyrics(client, site):
+    with Index() as index:
+        index.write(Band.for_id("125", client=client))
+        index.write(AlbumWrapper.for_id("547", client=client))
+        index.write(Lyrics("5018A", client=client))
+        text = str(Lyrics("5018A", client=client)).split()[2]
+
+        results = index.search_lyrics(text)
+        assert [row["id"] for row in results] == ["5018A"]
+        assert results[0]["album_id"] == "547"
+        assert text.lower() in results[0]["excerpt"].lower()
+        assert index.search_lyrics("") == []
+
+
+def test_index_existing_export(tmp_path):
+    path = str(tmp_path / "export.sqlite")
+    export_sqlite(RECORDS, path)
+    with Index(path) as index:
+        assert names(index.search_bands("flames")) == ["In Flames"]
+    # The full-text indexes are kept when the index is opened again
+    with Index(path) as index:
+        index.write(band("5", "Flames of Fury", "Sweden", [], "2001"))
+        assert len(index.search_bands("flames")) == 2
@@ -0,0 +1,312 @@
+import datetime
+import time
+
+import pytest
+
+from metallum.client import Client
+from metallum.consts import BASE_URL
+from metallum.identity_map import IdentityMap
+from metallum.models import Album, Band
+from metallum.models.album_types import AlbumTypes
+from metallum.object_cache import ObjectCache
+from metallum.operations import album_for_id, band_for_id, band_search, song_search
+
+
+def test_band(client, site):
+    band = band_for_id("125", client=client)
+    assert band.id == "125"
+    assert band.name == "Metallica"
+    assert band.country == "United States"
+    assert band.location == "Los Angeles/San Francisco, California"
+    assert band.status == "Active"
+    assert band.formed_in == "1981"
+    assert band.genres == [
+        "Thrash Metal (early)",
+        "Hard Rock (mid)",
+        "Heavy/Thrash Metal (later)",
+    ]
+    assert band.themes[:2] == ["Introspection", "Anger"]
+    assert band.label == "Blackened Recordings"
+    assert band.logo == "https://www.metal-archives.com/images/1/2/5/125_logo.png"
+    assert band.photo == "https://www.metal-archives.com/images/1/2/5/125_photo.jpg"
+    assert isinstance(band.added, datetime.datetime)
+    assert isinstance(band.modified, datetime.datetime)
+
+
+def test_band_albums(client, site):
+    band = band_for_id("125", client=client)
+    full_length = band.albums.search(type=AlbumTypes.FULL_LENGTH.value)
+    assert [album.title for album in full_length] == [
+        "Kill 'Em All",
+        "Ride the Lightning",
+        "Master of Puppets",
+    ]
+    assert len(band.albums.search(title="master of puppets")) == 2
+
+
+def test_band_similar_artists(client, site):
+    band = band_for_id("125", client=client)
+    assert [artist.name for artist in band.similar_artists] == ["Megadeth", "Testament"]
+
+
+def test_album(client, site):
+    album = album_for_id("547", client=client)
+    assert album.title == "Master of Puppets"
+    assert album.type == "Full-length"
+    assert album.date == datetime.datetime(1986, 3, 3, 0, 0)
+    assert album.year == 1986
+    assert album.label == "Elektra Records"
+    assert album.score == 79
+    assert album.review_count == 39
+    assert album.duration == 1226
+    assert album.cover == "https://www.metal-archives.com/images/5/4/7/547.jpg"
+    assert album.added is None
+    assert album.bands[0].name == "Metallica"
+
+
+def test_album_tracks(client, site):
+    album = album_for_id("547", client=client)
+    track = album.tracks[0]
+    assert len(album.tracks) == 3
+    assert track.id == "5018A"
+    assert track.title == "Battery"
+    assert track.number == 1
+    assert track.duration == 313
+    assert track.band.name == "Metallica"
+    assert (
+        str(track.lyrics).split("\n")[0]
+        == "Lashing out the action, returning the reaction"
+    )
+
+
+def test_split_album(client, site):
+    album = album_for_id("42682", client=client)
+    track = album.tracks[2]
+    assert [band.name for band in album.bands] == ["Lunar Aurora", "Paysage d'Hiver"]
+    assert track.full_title == "Lunar Aurora - A haudiga Fluag"
+    assert track.title == "A haudiga Fluag"
+    assert track.band.name == "Lunar Aurora"
+    assert album.score == 94
+
+
+def test_multi_disc_album(client, site):
+    album = album_for_id("338756", client=client)
+    assert album.disc_count == 2
+    assert album.tracks[-1].number == 4
+    assert album.tracks[-1].overall_number == 8
+    assert album.tracks[-1].disc_number == 2
+    assert album.duration == 36 * 60
+    assert album.label == "Osmose Productions"
+
+
+def test_search_results(client, site):
+    result = band_search("metallica", client=client)[0]
+    assert result.id == "125"
+    assert result.name == "Metallica"
+    assert result.get().name == "Metallica"
+
+    song = song_search(
+        "Fear of the Dark",
+        band="Iron Maiden",
+        release="Fear of the Dark",
+        client=client,
+    )[0]
+    assert song.id == "3449"
+    assert song.bands[0].name == "Iron Maiden"
+    assert song.album.title == "Fear of the Dark"
+
+
+def test_constructors_do_not_fetch(client, site):
+    band = Band("bands/_/125", client=client, name="Metallica")
+    album = Album("albums/_/_/547", client=client, title="Master of Puppets")
+    assert (band.id, band.name, repr(band)) == ("125", "Metallica", "<Band: Metallica>")
+    assert (album.id, album.title) == ("547", "Master of Puppets")
+    assert not site.requests
+
+    assert band.country == "United States"
+    assert len(site.requests) == 1
+
+
+def test_split_album_bands_are_not_fetched(client, site):
+    album = album_for_id("42682", client=client)
+    album.tracks[2].band  # pylint: disable=expression-not-assigned
+    fetched = [request.url for request in site.requests]
+    assert not any("/bands/" in url for url in fetched)
+
+
+def test_search_result_bands_are_not_fetched(client, site):
+    song = song_search(
+        "Fear of the Dark",
+        band="Iron Maiden",
+        release="Fear of the Dark",
+        client=client,
+    )[0]
+    assert song.bands[0].name == "Iron Maiden"
+    assert song.album.title == "Fear of the Dark"
+    assert len(site.requests) == 1
+
+
+def test_album_and_tracks_share_one_page(client, site):
+    album = album_for_id("547", client=client)
+    assert album.title == "Master of Puppets"
+    assert len(album.tracks) == 3
+    assert album.disc_count == 1
+    assert len(site.requests) == 1
+    assert album.tracks._page is album._album._page
+
+
+def test_lazy_album_and_tracks_share_one_page(client, site):
+    album = band_for_id("125", client=client).albums[3]
+    assert album.label == "Elektra Records"
+    assert len(album.tracks) == 3
+    assert [request.url.rsplit("/", 1)[-1] for request in site.requests] == [
+        "all",
+        "547",
+    ]
+
+
+def test_fields_are_memoized(client, site, monkeypatch):
+    band = band_for_id("125", client=client)
+    assert band.albums is band.albums
+    assert band.similar_artists is band.similar_artists
+    assert band.country == "United States"
+
+    calls = []
+    monkeypatch.setattr(
+        Band, "_dd_text_for_label", lambda self, label: calls.append(label)
+    )
+    assert band.country == "United States"
+    assert not calls
+
+
+def test_refresh(client, site):
+    band = band_for_id("125", client=client)
+    assert band.status == "Active"
+    site.pages["bands/_/125"] = site.pages["bands/_/125"].replace(
+        '<dd class="active">Active</dd>', '<dd class="split_up">Split-up</dd>'
+    )
+    client.cache.clear()
+    assert band.status == "Active"
+    assert band.refresh().status == "Split-up"
+
+
+def test_to_dict(client, site):
+    band = band_for_id("125", client=client).to_dict()
+    assert band["name"] == "Metallica"
+    assert band["genres"][0] == "Thrash Metal (early)"
+    assert set(band) == set(Band._snapshot_fields)
+
+    album = album_for_id("42682", client=client).to_dict()
+    assert album["type"] == "Split"
+    assert album["bands"] == [
+        {"id": "3524", "name": "Lunar Aurora"},
+        {"id": "3815", "name": "Paysage d'Hiver"},
+    ]
+    assert album["tracks"][2]["title"] == "A haudiga Fluag"
+    assert album["tracks"][2]["band"]["name"] == "Lunar Aurora"
+    assert len(site.requests) == 2
+
+
+def test_fields(client, site):
+    band = band_for_id("125", client=client)
+    assert list(band.fields) == [
+        "Country of origin",
+        "Location",
+        "Status",
+        "Formed in",
+        "Genre",
+        "Themes",
+        "Current label",
+    ]
+    assert band.fields["Formed in"].text() == "1981"
+    assert band._dd_text_for_label("Formed in :") == "1981"
+    assert band._dd_element_for_label("Unknown:") is None
+
+
+def test_object_cache(client, site):
+    client.object_cache = ObjectCache()
+    band = band_for_id("125", client=client)
+    snapshot = band.to_dict()
+    album = album_for_id("547", client=client).load()
+    album.title  # pylint: disable=pointless-statement
+    requests = len(site.requests)
+
+    cached_band = band_for_id("125", client=client)
+    cached_album = album_for_id("547", client=client)
+    assert cached_band.to_dict() == snapshot
+    assert cached_album.title == "Master of Puppets"
+    assert cached_album.bands[0].name == "Metallica"
+    assert not cached_band.is_loaded
+    assert len(site.requests) == requests
+
+    cached_band.refresh()
+    assert cached_band.name == "Metallica"
+    assert cached_band.is_loaded
+
+
+def test_object_cache_skips_broken_fields(client, site):
+    # An album without release date: its date can't be parsed
+    site.pages["albums/_/_/1"] = site.pages["albums/_/_/547"].replace(
+        "March 3rd, 1986", ""
+    )
+    client.object_cache = ObjectCache()
+    album = Album.for_id("1", client=client)
+    assert album.title == "Master of Puppets"
+    with pytest.raises(ValueError):
+        album.date  # pylint: disable=pointless-statement
+
+    cached_album = Album.for_id("1", client=client)
+    assert cached_album.title == "Master of Puppets"
+    assert not cached_album.is_loaded
+    with pytest.raises(ValueError):
+        cached_album.date  # pylint: disable=pointless-statement
+
+
+def test_object_cache_eviction(monkeypatch):
+    cache = ObjectCache(maxsize=2, ttl=10)
+    cache.put("a", {})
+    cache.put("b", {})
+    cache.get("a")
+    cache.put("c", {})
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("a") is None
+
+
+def test_identity_map(client, site, rate_limiter):
+    client.identity_map = IdentityMap()
+    band = band_for_id("125", client=client)
+    album = album_for_id("547", client=client)
+    assert band_for_id("125", client=client) is band
+    assert album_for_id("547", client=client) is album
+    assert album.bands[0] is band
+    assert album.tracks[0].band is band
+    assert band_search("metallica", client=client)[0].get() is band
+    assert band.albums[3]._album_entity is album._album_entity
+    # Each client has its own identity map
+    other = Client(
+        backend="memory", rate_limiter=rate_limiter, identity_map=IdentityMap()
+    )
+    other.mount(BASE_URL, site)
+    try:
+        assert band_for_id("125", client=other) is not band
+        assert band_for_id("125", client=other).name == "Metallica"
+    finally:
+        other.close()
+
+
+def test_identity_map_eviction():
+    class Entity:
+        pass
+
+    identity_map = IdentityMap(maxsize=1)
+    first = identity_map.get_or_create("a", Entity)
+    identity_map.get_or_create("b", Entity)
+    # Evicted from the map, but still alive
+    assert identity_map.get_or_create("a", Entity) is first
+
+    del first
+    identity_map.get_or_create("b", Entity)
+    assert "a" not in identity_map
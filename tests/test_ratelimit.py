@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from metallum.consts import BASE_URL
+from metallum.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+from tests.conftest import StubAdapter
+
+
+def test_bucket_allows_burst():
+    bucket = TokenBucket(rate=1, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(1, abs=0.05)
+
+
+def test_bucket_refills_while_idle():
+    bucket = TokenBucket(rate=100, burst=1)
+    bucket.reserve()
+    time.sleep(0.02)
+    assert bucket.reserve() == 0
+
+
+def test_limiter_is_shared_between_threads():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.07
+
+
+def test_limiter_per_host_budgets():
+    limiter = RateLimiter(rate=1, burst=1, per_host={"fast": (1000, 10)})
+    assert limiter.bucket("fast").burst == 10
+    assert limiter.bucket("other").burst == 1
+
+
+def test_limiter_async():
+    limiter = RateLimiter(rate=50, burst=1)
+
+    async def run():
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(3)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start >= 0.03
+
+
+def test_nested_prepaid_tokens():
+    limiter = RateLimiter(rate=1, burst=1)
+    limiter.acquire("host")
+    with limiter.prepaid("host"):
+        with limiter.prepaid("host"):
+            assert limiter.acquire("host") == 0
+        # The token of the outer call is kept
+        assert limiter.acquire("host") == 0
+    with limiter.prepaid("host"):
+        with limiter.prepaid("host"):
+            pass
+        # The unused token of the inner call is dropped
+        assert limiter.acquire("host") == 0
+    assert limiter.acquire("host") > 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2
+    assert parse_retry_after(None) is None
+
+
+def test_adapter_retries_throttled_responses(client):
+    stub = StubAdapter(
+        {
+            "release/ajax-view-lyrics/id/1": [
+                (429, "", {"Retry-After": "0"}),
+                "<p>Some lyrics</p>",
+            ]
+        },
+        backoff=0,
+    )
+    client.mount(BASE_URL, stub)
+
+    assert client.fetch("release/ajax-view-lyrics/id/1") == "<p>Some lyrics</p>"
+    assert len(stub.requests) == 2
+
+
+def test_adapter_gives_up_after_retries(client):
+    stub = StubAdapter(
+        {"release/ajax-view-lyrics/id/1": (429, "", {})}, retries=2, backoff=0
+    )
+    client.mount(BASE_URL, stub)
+
+    assert client.get("release/ajax-view-lyrics/id/1").status_code == 429
+    assert len(stub.requests) == 3
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+import requests
+
+from metallum.client import Client
+from metallum.consts import BASE_URL
+from metallum.operations import band_for_id
+from metallum.ratelimit import RateLimiter
+from metallum.replay import Cassette, CassetteMiss, ReplayAdapter, cassette_key
+from metallum.standin import StandInServer
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    return str(tmp_path / "site.jsonl")
+
+
+@pytest.fixture
+def recorded(site, rate_limiter, cassette_path):
+    """A cassette recorded from the stub site"""
+    cassette = Cassette(cassette_path)
+    client = Client(backend="memory", rate_limiter=rate_limiter)
+    client.mount(BASE_URL, ReplayAdapter(cassette, record=True, adapter=site))
+    band_for_id("125", client=client).to_dict()
+    client.get("bands/_/404")
+    client.close()
+    return cassette_path
+
+
+def test_record(recorded, site):
+    cassette = Cassette(recorded)
+    assert set(cassette) == {"/bands/_/125", "/bands/_/404"}
+    status, headers, body = cassette.get("/bands/_/125")
+    assert status == 200
+    assert "Metallica" in body
+    assert cassette.get("/bands/_/404")[0] == 404
+
+
+def test_replay(recorded, rate_limiter):
+    client = Client(backend="memory", rate_limiter=rate_limiter, cassette=recorded)
+    assert band_for_id("125", client=client).name == "Metallica"
+    with pytest.raises(CassetteMiss):
+        client.fetch("bands/_/1")
+
+
+def test_cassette_key():
+    assert cassette_key(BASE_URL + "/search/x?a=1&b=2") == "/search/x?a=1&b=2"
+
+
+def test_standin_server(recorded, rate_limiter):
+    with StandInServer(recorded, latency=0.05) as server:
+        client = Client(
+            backend="memory", rate_limiter=rate_limiter, base_url=server.url
+        )
+        start = time.monotonic()
+        assert band_for_id("125", client=client).name == "Metallica"
+        assert time.monotonic() - start >= 0.05
+        assert client.get("bands/_/1").status_code == 404
+        assert server.requests == 2
+
+
+def test_standin_server_throttles(recorded):
+    with StandInServer(recorded, rate=2, burst=1) as server:
+        response = requests.get(server.url + "/bands/_/125", timeout=5)
+        assert response.status_code == 200
+        response = requests.get(server.url + "/bands/_/125", timeout=5)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+        # The client backs off and retries
+        client = Client(
+            backend="memory",
+            rate_limiter=RateLimiter(rate=1000, burst=1000),
+            base_url=server.url,
+        )
+        assert band_for_id("125", client=client).name == "Metallica"
+        assert server.throttled >= 2
@@ -0,0 +1,132 @@
+import json
+import pickle
+import time
+from itertools import islice
+
+import pytest
+from pyquery import PyQuery
+
+from metallum.models.results import BandResult, decode_cell
+from metallum.models.search import Search
+from metallum.operations import band_search, band_search_url
+
+
+def search_page(start, total, size):
+    rows = [
+        [
+            f'<a href="https://www.metal-archives.com/bands/Band_{i}/{i}">Band {i}</a>',
+            "Black Metal",
+            "Norway",
+        ]
+        for i in range(start, min(start + size, total))
+    ]
+    return json.dumps({"iTotalRecords": total, "aaData": rows})
+
+
+@pytest.fixture
+def norway(stub):
+    total, size = 45, 10
+    for start in range(0, total, size):
+        url = band_search_url("", genre="black", countries=["NO"], page_start=start)
+        stub.pages[url] = search_page(start, total, size)
+    return stub
+
+
+def test_first_page_only(client, norway):
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    assert search.result_count == 45
+    assert len(search) == 10
+    assert len(norway.requests) == 1
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_results(client, norway, prefetch):
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    ids = [result.id for result in search.iter_results(prefetch=prefetch)]
+    assert ids == [str(i) for i in range(45)]
+    assert len(norway.requests) == 5
+
+
+def test_concurrent_prefetch_keeps_order(client, norway):
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    norway.delay = 0.2
+
+    start = time.monotonic()
+    results = search.iter_results(prefetch=True, workers=4)
+    assert [result.id for result in results] == [str(i) for i in range(45)]
+    assert time.monotonic() - start < 0.6
+    assert len(norway.requests) == 5
+
+
+def test_iter_results_limit(client, norway):
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    results = list(search.iter_results(limit=15))
+    assert [result.name for result in results][-1] == "Band 14"
+    assert len(norway.requests) == 2
+
+
+def test_pages_max_pages(client, norway):
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    pages = list(search.pages(max_pages=3))
+    assert [page.page_start for page in pages] == [0, 10, 20]
+    assert len(list(search.iter_results(max_pages=0))) == 0
+
+
+def test_pages_start_offset(client, norway):
+    search = band_search(
+        "", genre="black", countries=["NO"], page_start=30, client=client
+    )
+    assert [result.id for result in search.iter_results()] == [
+        str(i) for i in range(30, 45)
+    ]
+
+
+def test_results_are_compact_records(client, norway):
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    result = search[3]
+    assert not hasattr(result, "__dict__")
+    assert result == ["Band 3", "Black Metal", "Norway"]
+    assert list(result) == ["Band 3", "Black Metal", "Norway"]
+    assert len(result) == 3
+    assert result[-1] == "Norway"
+    assert result[1:] == ["Black Metal", "Norway"]
+    assert (result.id, result.name, result.country) == ("3", "Band 3", "Norway")
+    assert result.html is None
+    assert pickle.loads(pickle.dumps(result)) == result
+    assert len({result, search[3], search[4]}) == 2
+
+
+def test_results_keep_html_on_request(client, norway):
+    url = band_search_url("", genre="black", countries=["NO"])
+    search = Search(url, BandResult, client=client, keep_html=True)
+    assert search[0].html[0].startswith("<a href=")
+    page = next(islice(search.pages(), 1, None))
+    assert page[0].html is not None
+    # The search functions pass it through
+    search = band_search("", genre="black", countries=["NO"], client=client)
+    assert search[0].html is None
+    search = band_search(
+        "", genre="black", countries=["NO"], client=client, keep_html=True
+    )
+    assert search[0].html[0].startswith("<a href=")
+
+
+@pytest.mark.parametrize(
+    "cell",
+    [
+        '<a href="https://www.metal-archives.com/bands/Metallica/125">Metallica</a>',
+        '<a href="https://www.metal-archives.com/bands/Amorphis/9" title="Amorphis '
+        '(FI)">Amorphis</a>',
+        '<a href="https://www.metal-archives.com/albums/Amorphis/Tuonela/1">Tuonela'
+        "</a> <!-- 9.123 -->",
+        '<a href="https://www.metal-archives.com/bands/Lunar_Aurora/1">Lunar Aurora'
+        '</a> / <a href="https://www.metal-archives.com/bands/Paysage/2">Paysage '
+        "d&#039;Hiver</a>",
+        '<a href="https://www.metal-archives.com/bands/Bolt/3">Bolt  &amp;\n'
+        "Thrower</a>",
+    ],
+)
+def test_decode_cell_matches_html_parser(cell):
+    anchors = PyQuery(cell)("a")
+    links = tuple((a.attr("href"), a.text()) for a in anchors.items())
+    assert decode_cell(cell) == (anchors.text(), links)